@@ -1,6 +1,10 @@
 # create_file(day=5, year=2022)
 import argparse
+import os
+import sys
+from pathlib import Path
 
+from src.utils.input_store import FETCH_DIR, default_store
 from src.utils.template import create_file
 
 help_text = """
@@ -9,8 +13,132 @@ Create a new file for the Advent of Code challenge.
 
 parser = argparse.ArgumentParser(description=help_text)
 parser.add_argument("--create", "-c", nargs=2, type=int, help="Create a new file for the challenge. Format: -c 2 2022")
+parser.add_argument("--ingest", "-i", type=int, metavar="YEAR",
+                    help="Ingest inputs/NN.in files written by fetch.sh into the local input store. Format: -i 2022")
+parser.add_argument("--inputs", type=Path, default=FETCH_DIR, help="Directory to ingest from (default: inputs/)")
+
+commands = parser.add_subparsers(dest="command")
+
+run_parser = commands.add_parser("run", help="Solve every discovered day on a process pool")
+run_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to run (default: all)")
+run_parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: one per core)")
+run_parser.add_argument("--json", action="store_true", help="Stream results as JSON lines")
+run_parser.add_argument("--no-cache", action="store_true", help="Recompute answers instead of using the result cache")
+run_parser.add_argument("--backend", help="Implementation to use where a day registers several (default: $AOC_BACKEND)")
+
+compare_parser = commands.add_parser("compare", help="Flag benchmark regressions against the previous baseline")
+compare_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to compare (default: all)")
+compare_parser.add_argument("--baseline", "-b", help="Git revision to compare against (default: previous revision)")
+compare_parser.add_argument("--threshold", "-t", type=float, default=0.05, help="Relative change to flag (default: 0.05)")
+compare_parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for slowdowns")
+
+importtime_parser = commands.add_parser("importtime", help="Measure cold import time of every day module")
+importtime_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to measure (default: all)")
+importtime_parser.add_argument("--repeat", "-r", type=int, default=5, help="Fresh interpreters per day (default: 5)")
+importtime_parser.add_argument("--record", action="store_true", help="Record timings in the benchmark history")
+
+memory_parser = commands.add_parser("memory", help="Measure each part's peak RSS in a fresh process")
+memory_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to measure (default: all)")
+memory_parser.add_argument("--runs", "-r", type=int, default=1, help="Fresh processes per part, highest kept (default: 1)")
+
+monitor_parser = commands.add_parser("monitor", help="Count calls, lines and branches in one day with sys.monitoring")
+monitor_parser.add_argument("year", type=int)
+monitor_parser.add_argument("day", type=int)
+monitor_parser.add_argument("--part", "-p", choices=["a", "b"], action="append", help="Parts to count (default: both)")
+monitor_parser.add_argument("--events", "-e", nargs="+", choices=["calls", "lines", "branches"], default=["calls"],
+                            help="Events to count (default: calls). lines and branches fire on every line of a loop "
+                                 "and can cost more than cProfile")
+monitor_parser.add_argument("--top", type=int, default=15, help="Rows to show (default: 15)")
+
+commands.add_parser("env", help="Show the benchmark environment and what could make timings noisy")
+
+precompile_parser = commands.add_parser("precompile", help="Compile and cache every numba kernel ahead of time")
+precompile_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to compile (default: all)")
+
+registry_parser = commands.add_parser("registry", help="Rebuild and list the solver registry")
+registry_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to list (default: all)")
+
+cache_parser = commands.add_parser("cache", help="Show or clear the answer cache")
+cache_parser.add_argument("--clear", action="store_true", help="Remove cached answers")
+cache_parser.add_argument("--years", "-y", nargs="*", type=int, help="Only clear these years (default: all)")
+
+serve_parser = commands.add_parser("serve", help="Keep a warm solver process listening on a Unix socket")
+serve_parser.add_argument("--years", "-y", nargs="*", type=int, help="Years to warm up (default: all)")
+serve_parser.add_argument("--no-warm", action="store_true", help="Skip importing days and compiling kernels up front")
+serve_parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+solve_parser = commands.add_parser("solve", help="Solve one day through the daemon (in-process if none is running)")
+solve_parser.add_argument("year", type=int)
+solve_parser.add_argument("day", type=int)
+solve_parser.add_argument("--no-cache", action="store_true", help="Recompute answers instead of using the result cache")
+solve_parser.add_argument("--json", action="store_true", help="Print the response as JSON")
+solve_parser.add_argument("--backend", help="Implementation to use where the day registers several")
 
 args = parser.parse_args()
 
 if args.create:
     create_file(day=args.create[0], year=args.create[1])
+
+if args.ingest:
+    for day, digest in default_store().ingest(args.inputs, args.ingest).items():
+        print(f"{args.ingest} day {day:02d}: {digest[:12]}")
+
+if args.command == "run":
+    from src.utils.runner import run
+
+    if args.backend:
+        os.environ["AOC_BACKEND"] = args.backend
+
+    sys.exit(run(years=args.years, jobs=args.jobs, as_json=args.json, use_cache=not args.no_cache))
+
+if args.command == "compare":
+    from src.utils.history import History, print_comparisons
+
+    comparisons = History().compare(years=args.years, baseline_rev=args.baseline, threshold=args.threshold,
+                                    alpha=args.alpha)
+    sys.exit(print_comparisons(comparisons))
+
+if args.command == "importtime":
+    from src.utils.importtime import run as run_importtime
+
+    sys.exit(run_importtime(years=args.years, repeat=args.repeat, record=args.record))
+
+if args.command == "memory":
+    from src.utils.isolated import run as run_memory
+
+    sys.exit(run_memory(years=args.years, runs=args.runs))
+
+if args.command == "monitor":
+    from src.utils.monitoring import run as run_monitor
+
+    sys.exit(run_monitor(args.year, args.day, parts=args.part, events=args.events, top=args.top))
+
+if args.command == "env":
+    from src.utils.environment import run as run_env
+
+    sys.exit(run_env())
+
+if args.command == "precompile":
+    from src.utils.jit import run as run_precompile
+
+    sys.exit(run_precompile(years=args.years))
+
+if args.command == "registry":
+    from src.utils.registry import run as run_registry
+
+    sys.exit(run_registry(years=args.years))
+
+if args.command == "cache":
+    from src.utils.result_cache import run as run_cache
+
+    sys.exit(run_cache(clear=args.clear, years=args.years))
+
+if args.command == "serve":
+    from src.utils import daemon
+
+    sys.exit(daemon.stop() if args.stop else daemon.serve(years=args.years, warm=not args.no_warm))
+
+if args.command == "solve":
+    from src.utils import daemon
+
+    sys.exit(daemon.solve(args.year, args.day, use_cache=not args.no_cache, as_json=args.json, backend=args.backend))
@@ -2,8 +2,10 @@ import re
 
 from src.aoc.aoc2022 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 
 
+@parse_once
 def parse(txt: str) -> dict:
     path = []
     sizes = {}
@@ -40,9 +42,9 @@ def dir_sizes(sizes: dict) -> dict:
     return dirs
 
 
-def find_smallest(dir: dict, total: int, required: int, data: str) -> int:
+def find_smallest(dir: dict, total: int, required: int) -> int:
     freespace = total - dir[('/',)]
-    return min(size for _, size in dir_sizes(parse(data)).items() if (size > required - freespace) and (size < total))
+    return min(size for _, size in dir.items() if (size > required - freespace) and (size < total))
 
 
 def part_a(txt: str) -> int:
@@ -50,7 +52,7 @@ def part_a(txt: str) -> int:
 
 
 def part_b(txt: str) -> int:
-    return find_smallest(dir_sizes(parse(txt)), 70000000, 30000000, txt)
+    return find_smallest(dir_sizes(parse(txt)), 70000000, 30000000)
 
 
 def main(txt: str) -> None:
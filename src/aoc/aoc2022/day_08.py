@@ -2,6 +2,7 @@ import numpy as np
 
 from src.aoc.aoc2022 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 
 
 def parser_part_a(np_data: np.ndarray, bool_list: np.ndarray) -> int:
@@ -38,15 +39,20 @@ def parser_part_b(np_data: np.ndarray, bool_list: np.ndarray) -> int:
     return np.max(bool_list)
 
 
+@parse_once
+def parse(txt: str) -> np.ndarray:
+    return np.array([list(map(int, list(x))) for x in txt.splitlines()], dtype=int)
+
+
 def part_a(txt: str) -> int:
 
-    np_data = np.array([list(map(int, list(x))) for x in txt.splitlines()], dtype=int)
+    np_data = parse(txt)
     bool_list = np.full(np_data.shape, False, dtype=bool)
     return int(parser_part_a(np_data, bool_list))
 
 
 def part_b(txt: str) -> int:
-    np_data = np.array([list(map(int, list(x))) for x in txt.splitlines()], dtype=int)
+    np_data = parse(txt)
     bool_list = np.full(np_data.shape, 0, dtype=int)
 
     return int(parser_part_b(np_data, bool_list))
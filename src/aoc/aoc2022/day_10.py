@@ -1,9 +1,11 @@
 from typing import Tuple
 
 from src.aoc.aoc2022 import YEAR, get_day
-from src.aoc.aoc_helper import Aoc
+from src.aoc.aoc_helper import Aoc, side_effects
+from src.utils.parsing import parse_once
 
 
+@parse_once
 def parse(txt: str) -> Tuple[int, int]:
     cycles = 0
     x_reg = 1
@@ -31,6 +33,7 @@ def part_b(txt: str) -> str:
 
 
 
+@side_effects
 def main(txt: str) -> None:
     print("part_a: ", part_a(txt))
     print("part_b: ", part_b(txt))
@@ -1,4 +1,5 @@
 import math
+import random
 from dataclasses import dataclass
 from typing import List
 
@@ -37,6 +38,25 @@ def parse_input(txt: str) -> List:
     return [custom_string_parser(monkey) for monkey in txt.split("\n\n")]
 
 
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+
+
+def generate(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    monkeys = max(2, n // 180)
+    blocks = []
+    for i in range(monkeys):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 6)))
+        operation = f"old {rng.choice('*+')} {rng.randint(2, 19)}"
+        true_to, false_to = rng.sample([m for m in range(monkeys) if m != i], 2) if monkeys > 2 else [1 - i] * 2
+        blocks.append(
+            f"Monkey {i}:\n  Starting items: {items}\n  Operation: new = {operation}\n"
+            f"  Test: divisible by {rng.choice(PRIMES)}\n"
+            f"    If true: throw to monkey {true_to}\n    If false: throw to monkey {false_to}"
+        )
+    return "\n\n".join(blocks)
+
+
 def monkeeee(txt, iteration_amount=20, mod=3) -> int:
     for _ in range(iteration_amount):
         for monkey in txt:
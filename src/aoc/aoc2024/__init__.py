@@ -1,10 +1,9 @@
-import inspect
-import os
+import sys
 
 YEAR = 2024
 
 
 def get_day() -> int:
-    return int(
-        os.path.basename(inspect.stack()[1].filename).split("_")[1].split(".")[0]
-    )
+    from src.utils.registry import default_registry
+
+    return default_registry().day_of(sys._getframe(1).f_code.co_filename)
@@ -4,8 +4,10 @@ from typing import Tuple
 
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 
 
+@parse_once
 def parse(txt: str) -> tuple[tuple[int, ...], tuple[int, ...]]:
     l, r = list(
         map(
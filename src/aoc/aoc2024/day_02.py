@@ -3,15 +3,15 @@ from pathlib import Path
 from typing import TypeAlias
 
 import numpy as np
-from numba import njit
 
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.jit import kernel
 
 NDArray: TypeAlias = np.ndarray
 
 
-@njit
+@kernel("(float64[::1],)")
 def check_sequence(nums: np.ndarray) -> bool:
     if len(nums) <= 1:
         return True
@@ -20,7 +20,7 @@ def check_sequence(nums: np.ndarray) -> bool:
     return np.all((diffs >= 1) & (diffs <= 3)) or np.all((diffs >= -3) & (diffs <= -1))
 
 
-@njit
+@kernel("(float64[::1],)")
 def check_removable(nums: np.ndarray) -> bool:
     n = len(nums)
     for i in range(n):
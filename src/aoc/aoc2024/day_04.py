@@ -6,6 +6,7 @@ from more_itertools import flatten, locate
 
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.backends import backend
 
 
 def ray(grid: list[str], x: int, y: int, dx: int, dy: int) -> str:
@@ -16,6 +17,7 @@ def ray(grid: list[str], x: int, y: int, dx: int, dy: int) -> str:
     return "".join(grid[y][x] for y, x in valid)
 
 
+@backend("part_a", "itertools", default=True)
 def part_a(txt: str) -> int:
     grid = txt.splitlines()
     return sum(
@@ -31,6 +33,21 @@ def part_a(txt: str) -> int:
     )
 
 
+@backend("part_a", "loops")
+def part_a_loops(txt: str) -> int:
+    grid = txt.splitlines()
+    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+    count = 0
+    for y in range(len(grid)):
+        for x in range(len(grid[0])):
+            if grid[y][x] == "X":
+                for dy, dx in directions:
+                    if ray(grid, x, y, dx, dy) == "XMAS":
+                        count += 1
+    return count
+
+
 def part_b(txt: str) -> int:
     grid = txt.splitlines()
     return sum(
@@ -53,15 +70,3 @@ if __name__ == "__main__":
     aoc = Aoc(day=get_day(), years=YEAR)
     aoc.run(main, submit=False, part="both", readme_update=True, profile=True)
 
-# def part_a(txt: str) -> int:
-#     grid = txt.splitlines()
-#     directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-#
-#     count = 0
-#     for y in range(len(grid)):
-#         for x in range(len(grid[0])):
-#             if grid[y][x] == "X":
-#                 for dy, dx in directions:
-#                     if ray(grid, x, y, dx, dy) == "XMAS":
-#                         count += 1
-#     return count
@@ -1,14 +1,18 @@
+import random
 from typing import Tuple
 
 import numpy as np
 import numpy.typing as npt
-from numba import njit
 
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.backends import backend
+from src.utils.jit import kernel
+from src.utils.parsing import parse_once
+from src.utils.spans import span
 
 
-@njit
+@kernel("(int64[:, ::1],)")
 def parse_rules(rules_array: npt.NDArray) -> npt.NDArray:
     n = np.max(rules_array) + 1
     dep_matrix = np.zeros((n, n), dtype=np.int8)
@@ -17,7 +21,8 @@ def parse_rules(rules_array: npt.NDArray) -> npt.NDArray:
     return dep_matrix
 
 
-@njit
+@backend("check_order", "numba", default=True)
+@kernel("(int8[:, ::1], int64[::1])")
 def check_order(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
     # sourcery skip: use-any, use-next
     n = len(sequence)
@@ -28,7 +33,35 @@ def check_order(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
     return True
 
 
-@njit(parallel=True, cache=True)
+backend("check_order", "python")(check_order.py_func)
+
+
+@backend("check_order", "numba-loop")
+@kernel("(int8[:, ::1], int64[::1])")
+def check_order_loop(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
+    n = len(sequence)
+    for i in range(n):
+        curr = sequence[i]
+        for j in range(i + 1, n):
+            if deps[curr, sequence[j]] == 1:
+                return False
+    return True
+
+
+@backend("check_order", "numba-seen")
+@kernel("(int8[:, ::1], int64[::1])")
+def check_order_seen(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
+    # deps[b, a] means a must precede b, so a page is out of order when an
+    # earlier page lists it as a dependency: that is a column, not deps[num]
+    seen = np.zeros(deps.shape[0], dtype=np.bool_)
+    for num in sequence:
+        if np.any(deps[:, num] & seen):
+            return False
+        seen[num] = True
+    return True
+
+
+@kernel("(int8[:, ::1], int64[::1])", parallel=True)
 def find_valid_order(deps: npt.NDArray, numbers: npt.NDArray) -> npt.NDArray:
     n = len(numbers)
     result = np.empty(n, dtype=np.int64)
@@ -47,37 +80,60 @@ def find_valid_order(deps: npt.NDArray, numbers: npt.NDArray) -> npt.NDArray:
     return result
 
 
-def parse(txt: str) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+@parse_once
+@span("parse")
+def parse(txt: str) -> Tuple[npt.NDArray[np.int8], npt.NDArray[np.int64]]:
     rules_txt, sequences_txt = txt.split("\n\n")
 
-    return np.array(
-        [line.split("|") for line in rules_txt.splitlines()], dtype=np.int64
-    ), np.array(
-        [
-            np.fromstring(line, sep=",", dtype=np.int64)
-            for line in sequences_txt.splitlines()
-        ],
-        dtype=object,
-    )
+    with span("updates"):
+        # Filled element-wise: np.array(..., dtype=object) turns equal-length updates into a 2D array
+        lines = sequences_txt.splitlines()
+        sequences = np.empty(len(lines), dtype=object)
+        for i, line in enumerate(lines):
+            sequences[i] = np.fromstring(line, sep=",", dtype=np.int64)
+
+    with span("rules"):
+        rules_array = np.array([line.split("|") for line in rules_txt.splitlines()], dtype=np.int64)
+        return parse_rules(rules_array), sequences
+
+
+def generate(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    order = rng.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(order) for b in order[i + 1 :]]
+    rng.shuffle(rules)
+    rank = {page: i for i, page in enumerate(order)}
+
+    lines: list[str] = []
+    size = sum(map(len, rules)) + len(rules)
+    while size < n or not lines:
+        update = rng.sample(order, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=rank.__getitem__)
+        lines.append(",".join(map(str, update)))
+        size += len(lines[-1]) + 1
+    return "\n".join(rules) + "\n\n" + "\n".join(lines)
 
 
 def part_a(txt: str) -> int:
-    rules_array, sequences = parse(txt)
-    deps = parse_rules(rules_array)
+    deps, sequences = parse(txt)
 
-    return sum(seq[len(seq) // 2] for seq in sequences if check_order(deps, seq))
+    with span("check_order"):
+        return int(sum(seq[len(seq) // 2] for seq in sequences if check_order(deps, seq)))
 
 
 def part_b(txt: str) -> int:
-    rules_array, sequences = parse(txt)
-    deps = parse_rules(rules_array)
+    deps, sequences = parse(txt)
+
+    with span("check_order"):
+        unordered = [seq for seq in sequences if not check_order(deps, seq)]
 
-    total = 0
-    for seq in sequences:
-        if not check_order(deps, seq):
+    with span("find_valid_order"):
+        total = 0
+        for seq in unordered:
             fixed_order = find_valid_order(deps, seq)
             total += fixed_order[len(fixed_order) // 2]
-    return total
+        return int(total)
 
 
 def main(txt: str) -> None:
@@ -89,20 +145,3 @@ if __name__ == "__main__":
     aoc = Aoc(day=get_day(), years=YEAR)
     aoc.run(main, submit=False, part="both", readme_update=True, profile=True)
 
-# @njit
-# def check_order(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
-#     n = len(sequence)
-#     for i in range(n):
-#         curr = sequence[i]
-#         for j in range(i + 1, n):
-#             if deps[curr, sequence[j]] == 1:
-#                 return False
-#     return True
-# @njit
-# def check_order(deps: npt.NDArray, sequence: npt.NDArray) -> bool:
-#     seen = np.zeros_like(deps[0], dtype=np.bool_)
-#     for num in sequence:
-#         if np.any(deps[num] & seen):
-#             return False
-#         seen[num] = True
-#     return True
@@ -5,11 +5,10 @@ from typing import Set, Tuple
 import more_itertools as mi
 import numpy as np
 import numpy.typing as npt
-from numba import jit, njit
-from numba.typed import List
 
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 
 
 class foo(Exception):
@@ -34,7 +33,8 @@ def explore(mapping: dict[complex, str], start: complex) -> set[complex]:
     return {p for p, _ in seen}
 
 
-def parse_map(txt: str) -> tuple[dict[complex, str], complex]:
+@parse_once
+def parse(txt: str) -> tuple[dict[complex, str], complex]:
     # Vectorized parsing using numpy
     grid = np.array([list(line) for line in txt.splitlines()])
     rows, cols = grid.shape
@@ -48,12 +48,12 @@ def parse_map(txt: str) -> tuple[dict[complex, str], complex]:
 
 
 def part_a(txt: str) -> int:
-    mapping, start = parse_map(txt)
+    mapping, start = parse(txt)
     return len(explore(mapping, start))
 
 
 def part_b(txt: str) -> int:
-    mapping, start = parse_map(txt)
+    mapping, start = parse(txt)
     path = explore(mapping, start)
 
     path_set = set(path)
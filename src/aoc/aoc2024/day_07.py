@@ -1,23 +1,25 @@
 from typing import Tuple
 
-import numpy as np
-from numba import njit, prange
-from numba.typed import Dict
-from numba.typed import List as NumbaList
-
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.backends import backend
+from src.utils.memo import memoize
+from src.utils.parsing import parse_once
 
 from collections.abc import Generator, Sequence
 
 
-def parse(txt: str) -> Generator[tuple[int, tuple[int, ...]], None, None]:
+@parse_once
+def parse(txt: str) -> list[tuple[int, tuple[int, ...]]]:
+    equations = []
     for line in txt.splitlines():
         target, sep, nums = line.partition(": ")
         assert sep == ": "
-        yield int(target), tuple(map(int, nums.split()))
+        equations.append((int(target), tuple(map(int, nums.split()))))
+    return equations
 
 
+@backend("_possible_results", "generator", default=True)
 def _possible_results(nums: Sequence[int], *, concat_op: bool = False) -> Generator[int, None, None]:
     if len(nums) == 1:
         yield nums[0]
@@ -30,6 +32,23 @@ def _possible_results(nums: Sequence[int], *, concat_op: bool = False) -> Genera
             yield int(str(r) + str(last))
 
 
+@backend("_possible_results", "memo")
+@memoize(maxsize=1 << 16)
+def _possible_results_memo(nums: Tuple[int, ...], *, concat_op: bool = False) -> frozenset:
+    # Whole result sets instead of a lazy generator: no early exit on the target,
+    # but equations sharing a prefix (and warm repeat runs) reuse each other's work
+    if len(nums) == 1:
+        return frozenset(nums)
+    last = nums[-1]
+    results = set()
+    for r in _possible_results_memo(nums[:-1], concat_op=concat_op):
+        results.add(r + last)
+        results.add(r * last)
+        if concat_op:
+            results.add(int(str(r) + str(last)))
+    return frozenset(results)
+
+
 def solve(txt: str, *, concat_op: bool = False) -> int:
     return sum(target for target, nums in parse(txt) if target in _possible_results(nums, concat_op=concat_op))
 
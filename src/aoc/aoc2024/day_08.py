@@ -1,8 +1,10 @@
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 from collections import defaultdict
 import itertools
 
+@parse_once
 def parse(txt: str):
     antennas_by_freq = defaultdict(list)
     for y, line in enumerate(txt.splitlines()):
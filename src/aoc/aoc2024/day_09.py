@@ -1,10 +1,14 @@
+import random
+
 import numpy as np
-from numba import njit
 from src.aoc.aoc2024 import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.jit import kernel
+from src.utils.parsing import parse_once
+from src.utils.shared_input import Input, takes_bytes
 
-def parse_disk_map(s: str) -> np.ndarray:
-    d = np.fromiter((int(c) for c in s), dtype=np.int64)
+def parse_disk_map(digits: np.ndarray) -> np.ndarray:
+    d = digits.astype(np.int64)
     blocks = []
     fid = 0
     for i in range(len(d)):
@@ -18,7 +22,13 @@ def parse_disk_map(s: str) -> np.ndarray:
                 blocks.append(-1)
     return np.array(blocks, dtype=np.int64)
 
-@njit
+@parse_once
+def parse(txt: Input) -> np.ndarray:
+    # Digits read straight from the bytes, so a shared or mapped input is never decoded
+    raw = np.frombuffer(txt.encode() if isinstance(txt, str) else txt, dtype=np.uint8)
+    return parse_disk_map(raw[(raw >= ord("0")) & (raw <= ord("9"))] - ord("0"))
+
+@kernel("(int64[::1],)")
 def compute_checksum(b):
     s = 0
     for i in range(b.size):
@@ -26,7 +36,7 @@ def compute_checksum(b):
             s += i * b[i]
     return s
 
-@njit
+@kernel("(int64[::1],)")
 def find_files(b):
     max_fid = -1
     for i in range(b.size):
@@ -45,7 +55,7 @@ def find_files(b):
         file_info[fid,1] = length
     return file_info
 
-@njit
+@kernel("(int64[::1],)")
 def find_free_segments(b):
     segments = []
     seg_start = -1
@@ -66,7 +76,7 @@ def find_free_segments(b):
         arr[i,1] = seg[1]
     return arr
 
-@njit
+@kernel("(int64[::1], int64, int64, int64, int64[:, ::1])")
 def move_file(b, fid, start, length, free_segments):
     best_idx = -1
     for i in range(free_segments.shape[0]):
@@ -103,39 +113,46 @@ def move_file(b, fid, start, length, free_segments):
 
     return True
 
-def part_a(txt: str) -> int:
-    b = parse_disk_map(txt.strip())
-    @njit
-    def compact_disk(b):
-        while True:
-            left_free = -1
-            for i in range(b.size):
-                if b[i] == -1:
-                    left_free = i
-                    break
-            if left_free == -1:
+@kernel("(int64[::1],)")
+def compact_disk(b):
+    while True:
+        left_free = -1
+        for i in range(b.size):
+            if b[i] == -1:
+                left_free = i
                 break
-            has_file_right = False
-            for i in range(left_free+1, b.size):
-                if b[i] != -1:
-                    has_file_right = True
-                    break
-            if not has_file_right:
+        if left_free == -1:
+            break
+        has_file_right = False
+        for i in range(left_free+1, b.size):
+            if b[i] != -1:
+                has_file_right = True
                 break
-            right_file = -1
-            for i in range(b.size-1, -1, -1):
-                if b[i] != -1:
-                    right_file = i
-                    break
-            b[left_free] = b[right_file]
-            b[right_file] = -1
-        return b
+        if not has_file_right:
+            break
+        right_file = -1
+        for i in range(b.size-1, -1, -1):
+            if b[i] != -1:
+                right_file = i
+                break
+        b[left_free] = b[right_file]
+        b[right_file] = -1
+    return b
+
+def generate(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    n = max(1, n) | 1  # disk maps start and end with a file
+    return "".join(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)) for i in range(n))
 
+@takes_bytes
+def part_a(txt: Input) -> int:
+    b = parse(txt).copy()
     b = compact_disk(b)
     return compute_checksum(b)
 
-def part_b(txt: str) -> int:
-    b = parse_disk_map(txt.strip())
+@takes_bytes
+def part_b(txt: Input) -> int:
+    b = parse(txt).copy()
     file_info = find_files(b)
     free_segments = find_free_segments(b)
     # Move files in order of decreasing file ID number
@@ -1,28 +1,62 @@
-import cProfile
 import importlib
 import os
-import pstats
-from dataclasses import dataclass, field
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from pathlib import Path
 from timeit import default_timer as timer
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
-
-import big_o
-import numpy as np
-import psutil
-import pyperf
-from aocd import get_data, submit
-from aocd.models import Puzzle
-from rich import box
-from rich.console import Console
-from rich.layout import Layout
-from rich.panel import Panel
-from rich.progress import track
-from rich.table import Table
-
-PROJECT_ROOT = Path(__file__).parent.parent.parent
-console = Console()
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple, TypeVar, Union
+
+from src.utils.input_store import get_input, input_hash
+from src.utils.parsing import is_parse_hook
+from src.utils.paths import PROJECT_ROOT
+
+if TYPE_CHECKING:
+    import pstats
+
+    from rich.console import Console
+
+    from src.utils.allocations import AllocationStats
+    from src.utils.complexity import SizeTiming
+    from src.utils.environment import Environment
+    from src.utils.flamegraph import FlameGraph
+    from src.utils.isolated import ColdStart, MemoryCeiling
+    from src.utils.lineprof import LineProfile
+    from src.utils.memo import MemoStats
+    from src.utils.spans import PhaseTiming
+
+# Day modules import Aoc at top level but solve() only needs part_a/part_b, so
+# everything used for benchmarking, profiling and display is imported on first use
+
+
+class _LazyConsole:
+    _console: Optional["Console"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+F = TypeVar("F", bound=Callable)
+
+
+def side_effects(main: F) -> F:
+    """Mark a day's main as doing more than printing its answers (2022 day 10 draws its CRT).
+
+    Aoc.run prints answers from solve() instead of calling main, except for mains
+    marked so, which still run when the answers came from the result cache.
+    """
+    setattr(main, "side_effects", True)
+    return main
+
+
+def has_side_effects(func: Callable) -> bool:
+    return getattr(func, "side_effects", False)
 
 def format_memory(bytes_value: float) -> str:
     for unit in ["B", "KB", "MB", "GB", "TB"]:
@@ -41,6 +75,7 @@ class PyPerfResult:
     warnings: List[str] = field(default_factory=list)
     calibration_data: Dict[str, Any] = field(default_factory=dict)
     benchmark_info: Dict[str, Any] = field(default_factory=dict)
+    environment: Optional["Environment"] = None
 
     @property
     def coefficient_of_variation(self) -> float:
@@ -53,6 +88,10 @@ class PyPerfResult:
 class ComplexityResult:
     time_complexity: str
     r_squared: float
+    confidence: float = 0.0
+    runner_up: Optional[str] = None
+    sizes: List[int] = field(default_factory=list)  # characters of input per sweep point
+    timings_s: List[List[float]] = field(default_factory=list)  # every timing at each size
     fit_graph: Optional[Any] = None
 
 @dataclass
@@ -62,108 +101,165 @@ class PerformanceMetrics:
     memory_bytes: float
     memory_peak: float
     cpu_percent: float
+    iterations: int = 0
+    warmup_discarded: int = 0
+    ci_us: float = 0.0
+    converged: bool = False
+    parse_time_us: Optional[float] = None
+    phases: Optional[Dict[str, "PhaseTiming"]] = None
+    memo_stats: Optional[Dict[str, "MemoStats"]] = None
+    warm_cache_us: Optional[float] = None
+    first_call_us: Optional[float] = None
+    jit_compile_us: Optional[float] = None
+    cold_start: Optional["ColdStart"] = None
+    memory_ceiling: Optional["MemoryCeiling"] = None
+    allocations: Optional["AllocationStats"] = None
     complexity: Optional[ComplexityResult] = None
     pyperf_stats: Optional[PyPerfResult] = None
+    environment: Optional["Environment"] = None
     result: Any = None
-    profile_stats: Optional[pstats.Stats] = None
+    profile_stats: Optional["pstats.Stats"] = None
+    flamegraph: Optional["FlameGraph"] = None
+    line_profile: Optional["LineProfile"] = None
 
 class ComplexityAnalyzer:
     @staticmethod
-    def create_data_generator(data: str):
-        lines = data.split("\n") if isinstance(data, str) else data
-        total_size = len(lines)
-        def data_generator(n: int) -> str:
-            subset_size = max(1, int(n))
-            subset_size = min(subset_size, total_size)
-            return "\n".join(lines[:subset_size]) if isinstance(data, str) else lines[:subset_size]
-        return data_generator, total_size
+    def analyze(func: Callable, data: str, scale: float = 100.0, points: int = 12, n_timings: int = 3,
+                time_budget: float = 2.0, seed: int = 0, jobs: Optional[int] = None) -> ComplexityResult:
+        import numpy as np
 
-    @staticmethod
-    def analyze(func: Callable, data: str) -> ComplexityResult:
+        generate = getattr(sys.modules.get(func.__module__), "generate", None)
         try:
-            data_generator, data_size = ComplexityAnalyzer.create_data_generator(data)
-            min_n = max(2, data_size // 10)
-            best_fit, measurements = big_o.big_o(
-                func, data_generator=data_generator,
-                min_n=min_n, max_n=data_size,
-                n_repeats=3, n_timings=3
-            )
-            r_squared = 0.0
-            if measurements:
-                try:
-                    ns, times = zip(*measurements)
-                    if len(ns) > 1:
-                        r_squared = np.corrcoef(ns, times)[0, 1] ** 2
-                except:
-                    r_squared = 0.0
-            return ComplexityResult(time_complexity=str(best_fit), r_squared=r_squared)
+            if generate is not None:
+                return ComplexityAnalyzer.analyze_generated(
+                    func, generate, len(data), scale, points, n_timings, time_budget, seed, jobs
+                )
+            from src.utils.complexity import sweep
+
+            # Without a generator the sweep is over prefixes of the real input's
+            # lines, given to workers as byte lengths into one shared copy
+            raw = np.frombuffer(data.encode(), dtype=np.uint8)
+            line_ends = np.append(np.flatnonzero(raw == 10), raw.size)
+            lines = np.unique(np.linspace(max(2, len(line_ends) // 10), len(line_ends), points).astype(int))
+            sizes = [int(line_ends[n - 1]) for n in lines]
+            timings = sweep(func, sizes, seed, n_timings, time_budget, data=data, jobs=jobs)
+            return ComplexityAnalyzer.fit(timings, len(data), "n = input multiple")
         except Exception as e:
             console.print(f"[yellow]Warning: Complexity analysis failed: {str(e)}")
             return ComplexityResult(time_complexity="Unable to determine", r_squared=0.0)
 
-class Aoc:
-    _pyperf_runner = None
+    @staticmethod
+    def analyze_generated(func: Callable, generate: Callable[[int, int], str], data_size: int,
+                          scale: float = 100.0, points: int = 12, n_timings: int = 3,
+                          time_budget: float = 2.0, seed: int = 0, jobs: Optional[int] = None) -> ComplexityResult:
+        import numpy as np
+
+        from src.utils.complexity import sweep
+
+        # Geometric sweep from 1% of the real input up to `scale` times it, each
+        # size generated and timed in its own worker; sizes not yet started are
+        # dropped once one blows the per-size time budget. Starting that low still
+        # leaves enough points to fit quadratic solvers
+        sizes = np.unique(np.geomspace(max(2, data_size // 100), max(3, data_size * scale), points).astype(int))
+        timings: List["SizeTiming"] = []
+        for timing in sweep(func, [int(n) for n in sizes], seed, n_timings, time_budget, jobs=jobs):
+            if timings and timing.n <= timings[-1].n:
+                continue  # generators with a fixed header can't shrink below it
+            timings.append(timing)
+        return ComplexityAnalyzer.fit(
+            timings, data_size, f"n = input multiple, up to {timings[-1].n / data_size:.1f}x"
+        )
+
+    @staticmethod
+    def fit(timings: List["SizeTiming"], data_size: int, unit: str) -> ComplexityResult:
+        from src.utils.complexity import fit
+
+        # A short input, or a sweep the time budget cut short, leaves too few sizes to tell classes apart
+        if len(timings) < 3:
+            return ComplexityResult(time_complexity="Insufficient data", r_squared=0.0)
+        # Fit in multiples of the real input, raw character counts make the cubic fit rank-deficient
+        fitted = fit(timings, scale=data_size)
+        return ComplexityResult(
+            time_complexity=f"{fitted.time_complexity}, {unit}",
+            r_squared=fitted.r_squared,
+            confidence=fitted.confidence,
+            runner_up=fitted.runner_up,
+            sizes=[t.n for t in timings],
+            timings_s=[t.times_s for t in timings],
+        )
 
+class Aoc:
     def __init__(self, day: int = int(datetime.now().day), years: int = int(datetime.now().year),
-                 benchmark_mode: str = "quick"):
+                 benchmark_mode: Literal["quick", "normal", "accurate"] = "quick", stabilise: bool = False):
         self.day = day
         self.year = years
         self.benchmark_mode = benchmark_mode
-        self.data = get_data(day=self.day, year=self.year)
+        # Pin timed regions (and the workers they spawn) to quiet cores with the GC paused
+        self.stabilise = stabilise
+        self.data = get_input(self.year, self.day)
         self.test_module = importlib.import_module(f"tests.aoc{self.year}.{self.year}_day_{self.day:02d}_test")
-        self.process = psutil.Process()
+        self._process = None
+        # (part function, backend) pairs already called in this process, whose next
+        # call is no longer a first call
+        self._called: Set[Tuple[Callable, Optional[str]]] = set()
+
+    @contextmanager
+    def stable(self) -> Iterator[Optional["Environment"]]:
+        if not self.stabilise:
+            yield None
+            return
+        from src.utils.environment import stabilised
+
+        with stabilised() as environment:
+            yield environment
 
     @property
-    def pyperf_runner(self):
-        if Aoc._pyperf_runner is None:
-            is_jit = pyperf.python_has_jit()
-
-            if self.benchmark_mode == "quick":
-                processes = 3
-                warmups = 10
-            elif self.benchmark_mode == "normal":
-                processes = 6 if is_jit else 12
-                warmups = 100
-            else:  # accurate mode
-                processes = 6 if is_jit else 20
-                warmups = 1000
-
-            Aoc._pyperf_runner = pyperf.Runner(
-                processes=processes,
-                warmups=warmups,
-                values=3,
-                min_time=0.1,
-                show_name=True
-            )
-        return Aoc._pyperf_runner
+    def process(self):
+        if self._process is None:
+            import psutil
 
-    def run_pyperf_analysis(self, func: Callable, warmups: int = 1000, repeats: int = 1000) -> Optional[PyPerfResult]:
-        try:
-            print("\nStarting PyPerf analysis...")
-
-            # Configure runner for this specific benchmark
-            self.pyperf_runner.args = None  # Reset args before new benchmark
-            self.pyperf_runner.args = self.pyperf_runner.parse_args([
-                '--worker',
-                '--values', str(repeats),
-                '--warmups', str(warmups),
-                '--loops', '1000',  # Let PyPerf calibrate
-                '--rigorous',
-                '--processes', '30',
-            ])
-
-            # Run benchmark
-            benchmark = self.pyperf_runner.bench_func(
-                func.__name__,
-                lambda: func(self.data)
-            )
+            self._process = psutil.Process()
+        return self._process
 
-            if benchmark is None:
-                return PyPerfResult(
-                    mean=0.0,
-                    stdev=0.0,
-                    warnings=["Benchmark run failed and returned None"]
-                )
+    def run_pyperf_analysis(self, func: Callable, warmups: Optional[int] = None,
+                            repeats: Optional[int] = None, part: Optional[str] = None) -> Optional[PyPerfResult]:
+        # A selected backend is bound under another __name__, so callers that know the part pass it
+        part = part or func.__name__.removeprefix("part_")
+        if part not in ("a", "b"):
+            return PyPerfResult(mean=0.0, stdev=0.0, warnings=[f"{func.__name__} is not a part function"])
+
+        import subprocess
+
+        import numpy as np
+        import pyperf
+
+        from src.utils.pyperf_bench import MODE_FLAGS as PYPERF_MODE_FLAGS
+        from src.utils.pyperf_bench import output_path as pyperf_output_path
+
+        try:
+            path = pyperf_output_path(self.year, self.day, part)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.unlink(missing_ok=True)
+
+            # Spawn pyperf's own calibrated worker processes; benchmark_mode picks the preset
+            # and warmups/repeats only override it when given
+            cmd = [sys.executable, "-m", "src.utils.pyperf_bench", str(self.year), str(self.day), part,
+                   "--quiet", "-o", str(path), *PYPERF_MODE_FLAGS[self.benchmark_mode]]
+            if warmups is not None:
+                cmd += ["--warmups", str(warmups)]
+            if repeats is not None:
+                cmd += ["--values", str(repeats)]
+
+            from src.utils.environment import capture
+
+            status = console.status(f"[cyan]Running pyperf ({self.benchmark_mode}) for part {part}...")
+            with self.stable() as pinned, status:
+                environment = pinned or capture()
+                proc = subprocess.run(cmd, cwd=PROJECT_ROOT, capture_output=True, text=True)
+            if proc.returncode != 0:
+                return PyPerfResult(mean=0.0, stdev=0.0, warnings=[f"pyperf failed: {proc.stderr.strip()}"])
+
+            benchmark = pyperf.Benchmark.load(str(path))
 
             # Extract values and compute statistics
             values = benchmark.get_values()
@@ -182,13 +278,15 @@ class Aoc:
                 min_time=min(values),
                 max_time=max(values),
                 calibration_data={
-                    'total_loops': len(values),
-                    'inner_loops': 1,
-                    'total_runtime': sum(values)
+                    'total_loops': benchmark.get_total_loops(),
+                    'inner_loops': benchmark.get_inner_loops(),
+                    'total_runtime': benchmark.get_total_duration()
                 },
                 benchmark_info={
-                    'name': func.__name__,
+                    'name': benchmark.get_name(),
                     'samples': len(values),
+                    'processes': benchmark.get_nrun(),
+                    'path': str(path),
                 }
             )
 
@@ -208,7 +306,11 @@ class Aoc:
             if result.calibration_data['total_runtime'] < 1.0:
                 warnings.append("Short runtime")
 
+            # Whatever about the machine could explain the noise above
+            if warnings:
+                warnings.extend(environment.warnings)
             result.warnings = warnings
+            result.environment = environment
             return result
 
         except Exception as e:
@@ -218,54 +320,275 @@ class Aoc:
             traceback.print_exc()
             return PyPerfResult(mean=0.0, stdev=0.0, warnings=[error_msg])
 
-    def analyze_performance(self, func: Callable, runs: int = 100, with_profile: bool = False,
-                          analyze_complexity: bool = True, warmups: int = 5000, repeats: int = 10000) -> PerformanceMetrics:
-        times = []
+    def analyze_performance(self, func: Callable, runs: int = 10_000, with_profile: bool = False,
+                          analyze_complexity: bool = True, warmups: Optional[int] = None,
+                          repeats: Optional[int] = None,
+                          target_ci: float = 0.02, time_budget: float = 5.0,
+                          trace_allocations: bool = False, flamegraph: bool = False,
+                          fold_kernels: bool = True, line_profile: bool = False,
+                          cold_start: bool = False, cold_runs: int = 3,
+                          isolated_memory: bool = False, part: Optional[str] = None) -> PerformanceMetrics:
+        from src.utils.sampling import sample
+
+        part = part or func.__name__.removeprefix("part_")
+
         start_mem = self.process.memory_info().rss
         peak_mem = start_mem
         result = None
         profile_stats = None
         complexity_result = None
-        pyperf_result = self.run_pyperf_analysis(func, warmups, repeats)
+        allocation_stats = None
+        pyperf_result = self.run_pyperf_analysis(func, warmups, repeats, part=part)
+
+        # A fresh interpreter also pays for imports, input loading and numba's cache lookups
+        cold = None
+        if cold_start:
+            from src.utils.isolated import cold_start as measure_cold_start
+
+            try:
+                with self.stable(), console.status("[cyan]Measuring cold start..."):
+                    cold = measure_cold_start(self.year, self.day, part, runs=cold_runs)
+            except Exception as e:
+                console.print(f"[yellow]Warning: Cold start failed: {e}")
+
+        # Everything below reuses compiled kernels, so the first call is the only
+        # place compilation shows up. Cold starts give it from fresh interpreters;
+        # otherwise it is timed here, unless this part (under this backend) already ran
+        from src.utils.backends import selected_backend
+        from src.utils.jit import record_compilation
+
+        first_call_us = jit_compile_us = None
+        called = (func, selected_backend())
+        if cold is not None:
+            first_call_us, jit_compile_us = cold.first_call_us, cold.jit_compile_us or None
+            result = func(self.data)
+        elif called in self._called:
+            result = func(self.data)
+        else:
+            with record_compilation() as compilation:
+                start = timer()
+                result = func(self.data)
+                first_call_us = (timer() - start) * 1e6
+            jit_compile_us = compilation.compile_us if compilation.events else None
+        self._called.add(called)
+
+        # RSS in this process also carries pyperf, numpy and every earlier part
+        ceiling = None
+        if isolated_memory:
+            from src.utils.isolated import memory_ceiling
+
+            with console.status("[cyan]Measuring peak memory in a fresh process..."):
+                ceiling = memory_ceiling(self.year, self.day, part)
 
         if analyze_complexity:
             complexity_result = ComplexityAnalyzer.analyze(func, self.data)
 
         if with_profile:
+            import cProfile
+            import pstats
+
             profiler = cProfile.Profile()
             profiler.enable()
             result = func(self.data)
             profiler.disable()
             profile_stats = pstats.Stats(profiler)
 
-        for _ in track(range(50), description="Running performance analysis..."):
+        flame = None
+        if flamegraph:
+            from src.utils import flamegraph as sampling_profiler
+
+            # Sampled rather than traced, so tight loops keep their shape; the
+            # parse cache is cleared per call so shared parsing shows up too
+            parse_hook = getattr(sys.modules.get(func.__module__), "parse", None)
+            with console.status("[cyan]Sampling flame graph..."):
+                flame = sampling_profiler.write(sampling_profiler.profile(
+                    lambda: func(self.data),
+                    name=f"{self.year}_day_{self.day:02d}_{part}",
+                    fold_kernels=fold_kernels,
+                    module=sys.modules.get(func.__module__),
+                    setup=parse_hook.cache_clear if is_parse_hook(parse_hook) else None,
+                ))
+
+        line_stats = self.line_profile(func, part) if line_profile else None
+
+        if trace_allocations:
+            from src.utils.allocations import measure_allocations
+
+            with console.status("[cyan]Tracing allocations..."):
+                allocation_stats, result = measure_allocations(lambda: func(self.data))
+
+        # A day's parse_once hook is shared by both parts, so time it on its own
+        # and keep it warm for the loop below, which then measures the solve alone
+        parse_time_us = None
+        parse_hook = getattr(sys.modules.get(func.__module__), "parse", None)
+        if is_parse_hook(parse_hook):
+            parse_hook.cache_clear()
+            parse_time_us = sample(
+                lambda: parse_hook.uncached(self.data), target_ci=target_ci, time_budget=min(time_budget, 1.0)
+            ).mean_us
+            parse_hook(self.data)
+
+        # Spans marked in the day module, re-parsing each call so parse phases show;
+        # empty (and free) for days without any
+        from src.utils.spans import measure_phases
+
+        phases = measure_phases(
+            lambda: func(self.data),
+            setup=parse_hook.cache_clear if is_parse_hook(parse_hook) else None,
+            time_budget=min(time_budget, 0.5),
+        ) or None
+        if is_parse_hook(parse_hook):
+            parse_hook(self.data)
+
+        from src.utils.memo import memo_caches
+
+        memos = memo_caches(sys.modules[func.__module__])
+
+        def clear_cache() -> None:
             if hasattr(func, "cache"):
                 func.cache.clear()
-            pre_mem = self.process.memory_info().rss
-            start = timer()
-            result = func(self.data)
-            end = timer()
-            post_mem = self.process.memory_info().rss
-            peak_mem = max(peak_mem, post_mem)
-            times.append((end - start) * 1e6)
+            for cache in memos.values():
+                cache.clear()
+
+        def track_memory() -> None:
+            nonlocal peak_mem
+            peak_mem = max(peak_mem, self.process.memory_info().rss)
+
+        from src.utils.environment import capture
+
+        with self.stable() as pinned, console.status("[cyan]Running performance analysis..."):
+            environment = pinned or capture()
+            samples = sample(
+                lambda: func(self.data),
+                target_ci=target_ci,
+                time_budget=time_budget,
+                max_samples=runs,
+                setup=clear_cache,
+                teardown=track_memory,
+                disable_gc=self.stabilise,
+            )
+        result = samples.result
+
+        # The loop above is cold: every call starts from empty memo caches. One
+        # more cold call gives their counters, then the warm loop keeps what it left
+        memo_stats = warm_cache_us = None
+        if memos:
+            clear_cache()
+            func(self.data)
+            memo_stats = {name: replace(cache.stats) for name, cache in memos.items()
+                          if cache.stats.hits or cache.stats.misses}
+            with console.status("[cyan]Timing with warm memo caches..."):
+                warm_cache_us = sample(
+                    lambda: func(self.data), target_ci=target_ci, time_budget=min(time_budget, 1.0), max_samples=runs,
+                ).mean_us
 
         end_mem = self.process.memory_info().rss
         memory_used = end_mem - start_mem
         peak_memory_used = peak_mem - start_mem
 
         return PerformanceMetrics(
-            execution_time_us=np.mean(times),
-            time_std_us=np.std(times),
+            execution_time_us=samples.mean_us,
+            time_std_us=samples.std_us,
             memory_bytes=memory_used,
-            memory_peak=peak_memory_used,
+            memory_peak=ceiling.peak_rss if ceiling else peak_memory_used,
             cpu_percent=self.process.cpu_percent(),
+            iterations=samples.iterations,
+            warmup_discarded=samples.warmup,
+            ci_us=samples.ci_us,
+            converged=samples.converged,
+            parse_time_us=parse_time_us,
+            phases=phases,
+            memo_stats=memo_stats,
+            warm_cache_us=warm_cache_us,
+            first_call_us=first_call_us,
+            jit_compile_us=jit_compile_us,
+            cold_start=cold,
+            memory_ceiling=ceiling,
+            allocations=allocation_stats,
             complexity=complexity_result,
             pyperf_stats=pyperf_result,
+            environment=environment,
             result=result,
-            profile_stats=profile_stats
+            profile_stats=profile_stats,
+            flamegraph=flame,
+            line_profile=line_stats,
         )
 
+    def compare_backends(self, part: Literal["a", "b"], **options: Any) -> Dict[str, PerformanceMetrics]:
+        """analyze_performance for every backend registered in the day module, on the same input."""
+        from src.utils.backends import backends_of, using_backend
+        from src.utils.registry import default_registry
+
+        module = default_registry().module(self.year, self.day)
+        results = {}
+        for label in backends_of(module):
+            with using_backend(module, label):
+                console.print(f"[cyan]Backend {label}...")
+                results[label] = self.analyze_performance(getattr(module, f"part_{part}"), part=part, **options)
+        return results
+
+    def print_backends(self, results: Dict[str, PerformanceMetrics], part: str) -> bool:
+        from rich import box
+        from rich.table import Table
+
+        reference = next(iter(results.values())).result
+        fastest = min(m.execution_time_us for m in results.values())
+        table = Table(box=box.ROUNDED, title=f"Part {part.upper()} Backends")
+        table.add_column("Backend", style="cyan")
+        table.add_column("Time", style="green", justify="right")
+        table.add_column("vs Fastest", justify="right")
+        table.add_column("First Call", justify="right")
+        table.add_column("Result")
+        agree = True
+        for label, metrics in results.items():
+            matches = metrics.result == reference
+            agree &= matches
+            table.add_row(
+                label,
+                f"{metrics.execution_time_us:.1f}µs ± {metrics.time_std_us:.1f}",
+                f"{metrics.execution_time_us / fastest:.2f}x" if fastest else "",
+                f"{metrics.first_call_us:.1f}µs" if metrics.first_call_us is not None else "",
+                str(metrics.result) if matches else f"[red]{metrics.result} (expected {reference})[/red]",
+            )
+        console.print(table)
+        return agree
+
+    def line_profile(self, func: Callable, part: Optional[str] = None) -> "LineProfile":
+        from src.utils import lineprof
+
+        part = part or func.__name__.removeprefix("part_")
+        with console.status("[cyan]Line profiling..."):
+            return lineprof.write(lineprof.profile_lines(func, self.data, name=f"{self.year}_day_{self.day:02d}_{part}"))
+
+    def print_line_profile(self, profile: "LineProfile") -> None:
+        from rich import box
+        from rich.markup import escape
+        from rich.table import Table
+
+        table = Table(box=box.SIMPLE, title="Hot Lines")
+        table.add_column("Line", style="cyan", no_wrap=True)
+        table.add_column("Hits", justify="right", no_wrap=True)
+        table.add_column("Time", style="green", justify="right", no_wrap=True)
+        table.add_column("Per Hit", justify="right", no_wrap=True)
+        table.add_column("%", justify="right", no_wrap=True)
+        table.add_column("Source")
+        for line in profile.hot_lines:
+            table.add_row(
+                f"{line.function}:{line.line}",
+                str(line.hits),
+                f"{line.time_us/1e3:.2f}ms",
+                f"{line.time_us/line.hits:.2f}µs" if line.hits else "",
+                f"{line.time_us/profile.total_us:.1%}" if profile.total_us else "",
+                escape(line.source),
+            )
+        console.print(table)
+        if profile.json_path:
+            console.print(f"[dim]line timings: {os.path.relpath(profile.json_path, PROJECT_ROOT)}[/dim]")
+
     def print_metrics(self, metrics: PerformanceMetrics, part: str):
+        from rich import box
+        from rich.table import Table
+
         def format_time(t: float) -> str:
             if t < 0.000001: return f"{t*1e9:.1f}ns"
             if t < 0.001: return f"{t*1e6:.1f}µs"
@@ -280,24 +603,124 @@ class Aoc:
             "Execution Time",
             f"{format_time(metrics.execution_time_us/1e6)} ± {format_time(metrics.time_std_us/1e6)}"
         )
+        if metrics.parse_time_us is not None:
+            table.add_row("Parse (shared)", format_time(metrics.parse_time_us/1e6))
+        if metrics.warm_cache_us is not None:
+            table.add_row("Warm Memo Caches", format_time(metrics.warm_cache_us/1e6))
+        for name, memo in (metrics.memo_stats or {}).items():
+            table.add_row(
+                f"Memo {name}",
+                f"{memo.hit_rate:.0%} hits in a cold call ({memo.hits}/{memo.hits + memo.misses}), "
+                f"{memo.entries} entries, {format_memory(memo.bytes)}, {memo.evictions} evicted"
+                f"{f', {memo.disk_hits} from disk' if memo.disk_hits else ''}"
+            )
+        if metrics.first_call_us is not None:
+            table.add_row("First Call", format_time(metrics.first_call_us/1e6))
+        if metrics.jit_compile_us is not None:
+            table.add_row("JIT Compile", f"{format_time(metrics.jit_compile_us/1e6)} (in first call)")
+        if metrics.cold_start:
+            cold = metrics.cold_start
+            table.add_row(
+                "Cold Start",
+                f"{format_time(cold.execution_time_us/1e6)} ± {format_time(cold.time_std_us/1e6)} per process "
+                f"({cold.iterations} runs)"
+            )
+            table.add_row(
+                "Cold Breakdown",
+                f"import {format_time(cold.import_us/1e6)}, input {format_time(cold.input_us/1e6)}, "
+                f"first call {format_time(cold.first_call_us/1e6)}"
+                f"{f' (JIT {format_time(cold.jit_compile_us/1e6)})' if cold.jit_compile_us else ''}"
+            )
+        if metrics.iterations:
+            table.add_row(
+                "Iterations",
+                f"{metrics.iterations} ({metrics.warmup_discarded} warm-up discarded, "
+                f"95% CI ± {format_time(metrics.ci_us/1e6)}{'' if metrics.converged else ', budget hit'})"
+            )
         if metrics.memory_bytes > 0:
             table.add_row("Memory Usage", format_memory(metrics.memory_bytes))
-        if metrics.memory_peak > 0:
+        if metrics.memory_ceiling:
+            ceiling = metrics.memory_ceiling
+            table.add_row(
+                "Peak RSS (isolated)",
+                f"{format_memory(ceiling.peak_rss)} per process, {format_memory(ceiling.call_rss)} raised by the part "
+                f"({len(ceiling.samples)} samples)"
+            )
+        elif metrics.memory_peak > 0:
             table.add_row("Peak Memory", format_memory(metrics.memory_peak))
         if metrics.cpu_percent > 0:
             table.add_row("CPU Usage", f"{metrics.cpu_percent:.1f}%")
+        if metrics.allocations:
+            table.add_row("Allocated Peak", f"{format_memory(metrics.allocations.peak_bytes)} per call")
+            table.add_row("Allocated Net", f"{format_memory(metrics.allocations.net_bytes)} per call")
         if metrics.complexity:
+            complexity = metrics.complexity
             table.add_row(
                 "Time Complexity",
-                f"{metrics.complexity.time_complexity} (R² = {metrics.complexity.r_squared:.3f})"
+                f"{complexity.time_complexity} (R² = {complexity.r_squared:.3f}"
+                f"{f', {complexity.confidence:.0%} confident' if complexity.sizes else ''}"
+                f"{f', else {complexity.runner_up}' if complexity.runner_up else ''})"
             )
+            if complexity.sizes:
+                table.add_row(
+                    "Complexity Sweep",
+                    ", ".join(f"{n}: {format_time(min(times))}" for n, times in zip(complexity.sizes, complexity.timings_s))
+                )
+        if metrics.environment:
+            env = metrics.environment
+            table.add_row(
+                "Environment",
+                f"{env.cpu_model}, {len(env.usable_cores)}/{env.cores} cores{' (pinned)' if env.stabilised else ''}, "
+                f"governor {env.governor or 'n/a'}, load {env.load[0]:.2f}",
+            )
+            for warning in env.warnings:
+                table.add_row("", f"[yellow]{warning}[/yellow]")
         console.print(table)
 
+        if metrics.phases:
+            phases = Table(box=box.SIMPLE, title="Phases (per call, parse included)")
+            phases.add_column("Phase", style="cyan")
+            phases.add_column("Time", style="green", justify="right")
+            phases.add_column("Share", justify="right")
+            phases.add_column("Entries", justify="right")
+            for path, phase in metrics.phases.items():
+                phases.add_row(
+                    "  " * path.count("/") + path.rsplit("/", 1)[-1], format_time(phase.mean_us/1e6),
+                    f"{phase.share:.1%}", f"{phase.entries:g}",
+                )
+            console.print(phases)
+
+        if metrics.allocations and metrics.allocations.top_sites:
+            sites = Table(box=box.SIMPLE, title="Top Allocation Sites")
+            sites.add_column("Location", style="cyan")
+            sites.add_column("Size", style="green", justify="right")
+            sites.add_column("Blocks", justify="right")
+            for site in metrics.allocations.top_sites:
+                location = os.path.relpath(site.location, PROJECT_ROOT) if site.location.startswith("/") else site.location
+                sites.add_row(location, format_memory(site.size_bytes), str(site.count))
+            console.print(sites)
+
         if metrics.profile_stats:
             console.print("\n[bold cyan]Profile Details:[/bold cyan]")
             console.print("[dim]Top 10 functions by cumulative time:[/dim]")
             metrics.profile_stats.sort_stats("cumulative").print_stats(10)
 
+        if metrics.flamegraph:
+            flame = metrics.flamegraph
+            frames = Table(box=box.SIMPLE, title=f"Sampled Self Time ({flame.samples} samples"
+                           f"{f', {format_time(flame.kernel_us/1e6)} in numba' if flame.kernel_us else ''})")
+            frames.add_column("Frame", style="cyan")
+            frames.add_column("Share", style="green", justify="right")
+            for frame, share in flame.top_frames:
+                frames.add_row(frame, f"{share:.1%}")
+            console.print(frames)
+            if flame.speedscope_path and flame.collapsed_path:
+                console.print(f"[dim]speedscope: {os.path.relpath(flame.speedscope_path, PROJECT_ROOT)}  "
+                              f"collapsed: {os.path.relpath(flame.collapsed_path, PROJECT_ROOT)}[/dim]")
+
+        if metrics.line_profile:
+            self.print_line_profile(metrics.line_profile)
+
         if metrics.pyperf_stats:
             if metrics.pyperf_stats.warnings:
                 console.print("\n[yellow]PyPerf Warnings:[/yellow]")
@@ -330,6 +753,8 @@ class Aoc:
             return False
 
     def submit(self, answer, part=None) -> None:
+        from aocd import submit
+
         submit(answer, part=part, day=self.day, year=self.year)
 
     def get_data(self) -> str:
@@ -340,6 +765,8 @@ class Aoc:
         pytest.main([f"tests/aoc{self.year}/{self.year}_day_{self.day:02d}_test.py", "-v"])
 
     def get_problem_name(self) -> str:
+        from aocd.models import Puzzle
+
         puzzle = Puzzle(year=self.year, day=self.day)
         return puzzle.title
 
@@ -385,17 +812,36 @@ class Aoc:
 
     def run(self, func=None, submit: bool = False, part: Union[None, str] = None,
             readme_update: bool = False, profile: bool = False, analyze_complexity: bool = False,
-            warmups: int =10, repeats: int =10, runs: int =10) -> Dict[str, PerformanceMetrics]:
+            warmups: Optional[int] = None, repeats: Optional[int] = None, runs: int =10_000, target_ci: float = 0.02,
+            time_budget: float = 5.0, trace_allocations: bool = False, flamegraph: bool = False,
+            fold_kernels: bool = True, line_profile: bool = False,
+            backends: bool = False, cold_start: bool = False, isolated_memory: bool = False) -> Dict[str, PerformanceMetrics]:
         console.rule(f"[bold blue]Advent of Code {self.year} - Day {self.day}")
-        metrics = {}
-
-        if func is not None:
-            with console.status("[cyan]Running main function..."):
-                func(self.get_data())
-
-        modules = importlib.import_module(f"src.aoc.aoc{self.year}.day_{self.day:02d}")
-
-        parts_to_run = []
+        metrics: Dict[str, PerformanceMetrics] = {}
+
+        # Answers come from the result cache, or are solved once into it, so main
+        # is not run just to compute them again. A miss has already run the parts
+        # and whatever they draw; on a hit, mains marked @side_effects still run
+        from src.aoc import solve_cached
+
+        with console.status("[cyan]Solving..."):
+            solved, hits = solve_cached(self.year, self.day, self.data)
+        answers = dict(zip("ab", solved))
+        ran_main = func is not None and hits and has_side_effects(func)
+        if ran_main:
+            func(self.data)
+        elif func is not None:
+            for name, answer in answers.items():
+                console.print(f"part_{name}: {answer}")
+
+        from src.utils.backends import selected_backend
+        from src.utils.registry import default_registry
+
+        solvers = default_registry().parts(self.year, self.day)
+        if ran_main or hits < len(solvers):
+            self._called.update((solver, selected_backend()) for solver in solvers.values())
+
+        parts_to_run: List[Literal["a", "b"]] = []
         if part == "a" or part == "both":
             parts_to_run.append("a")
         if part == "b" or part == "both":
@@ -408,7 +854,7 @@ class Aoc:
 
         for part_name in parts_to_run:
             console.rule(f"[yellow]Part {part_name.upper()}")
-            part_func = getattr(modules, f"part_{part_name}")
+            part_func = solvers[part_name]
 
             if profile:
                 metrics[part_name] = self.analyze_performance(
@@ -417,14 +863,45 @@ class Aoc:
                     warmups=warmups,
                     repeats=repeats,
                     analyze_complexity=analyze_complexity,
-                    with_profile=True
+                    with_profile=True,
+                    target_ci=target_ci,
+                    time_budget=time_budget,
+                    trace_allocations=trace_allocations,
+                    flamegraph=flamegraph,
+                    fold_kernels=fold_kernels,
+                    line_profile=line_profile,
+                    cold_start=cold_start,
+                    isolated_memory=isolated_memory,
+                    part=part_name,
                 )
                 self.print_metrics(metrics[part_name], part_name)
+                from src.utils.history import History
+
+                history = History()
+                history.record(self.year, self.day, part_name, metrics[part_name], input_hash(self.data))
+                if metrics[part_name].cold_start:
+                    history.record(self.year, self.day, f"{part_name}:cold", metrics[part_name].cold_start,
+                                   input_hash(self.data))
+            elif line_profile:
+                self.print_line_profile(self.line_profile(part_func, part_name))
+
+            if backends:
+                comparison = self.compare_backends(
+                    part_name, runs=runs, warmups=warmups, repeats=repeats, analyze_complexity=False,
+                    target_ci=target_ci, time_budget=time_budget,
+                )
+                if not self.print_backends(comparison, part_name):
+                    console.print(f"[red]✗ Backends disagree on part {part_name}")
+                from src.utils.history import History
+
+                history = History()
+                for label, backend_metrics in comparison.items():
+                    history.record(self.year, self.day, f"{part_name}@{label}", backend_metrics, input_hash(self.data))
 
             if test_results[part_name] and submit:
                 with console.status(f"[green]Submitting part {part_name}..."):
                     try:
-                        result = metrics[part_name].result if profile else part_func(self.data)
+                        result = metrics[part_name].result if profile else answers[part_name]
                         self.submit(result, part=part_name)
                         console.print(f"[green]✓ Part {part_name} submitted successfully")
                     except Exception as e:
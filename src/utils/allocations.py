@@ -0,0 +1,99 @@
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size_bytes: int
+    count: int
+
+
+@dataclass
+class AllocationStats:
+    peak_bytes: int
+    net_bytes: int
+    calls: int
+    top_sites: List[AllocationSite] = field(default_factory=list)
+
+
+class PeakWatcher(threading.Thread):
+    # Transient allocations are gone by the time the call returns, so snapshot
+    # from a side thread whenever traced memory climbs to a new high
+    def __init__(self, baseline: int, interval: float = 0.001, growth: float = 1.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._done = threading.Event()
+        self._high = baseline
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._high * self.growth:
+                self._high = current
+                self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def measure_allocations(func: Callable[[], Any], calls: int = 3, top: int = 10) -> Tuple[AllocationStats, Any]:
+    # Peak is the high-water mark of traced memory above what was live before
+    # the call; net is what the call left behind (including its result).
+    # Sites are taken at the observed peak of the last call
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+
+    peak = 0
+    net = 0
+    result = None
+    sites: List[AllocationSite] = []
+    try:
+        for i in range(calls):
+            result = None
+            watcher = None
+            if i == calls - 1:
+                watcher = PeakWatcher(tracemalloc.get_traced_memory()[0])
+                watcher.start()
+            before = tracemalloc.take_snapshot().filter_traces(IGNORED)
+            current_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            result = func()
+
+            current_after, peak_after = tracemalloc.get_traced_memory()
+            peak = max(peak, peak_after - current_before)
+            net += current_after - current_before
+
+            if watcher is not None:
+                watcher.stop()
+                after = (watcher.snapshot or tracemalloc.take_snapshot()).filter_traces(IGNORED)
+                sites = [
+                    AllocationSite(
+                        location=f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                        size_bytes=stat.size_diff,
+                        count=stat.count_diff,
+                    )
+                    for stat in after.compare_to(before, "lineno")[:top]
+                    if stat.size_diff > 0
+                ]
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    return AllocationStats(peak_bytes=peak, net_bytes=net // calls, calls=calls, top_sites=sites), result
@@ -0,0 +1,85 @@
+import os
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+ENV_VAR = "AOC_BACKEND"
+
+# module name -> function name -> backend -> implementation
+_variants: Dict[str, Dict[str, Dict[str, Callable]]] = {}
+_defaults: Dict[str, Dict[str, str]] = {}
+
+
+def backend(name: str, label: str, default: bool = False) -> Callable[[F], F]:
+    """Register `func` as the `label` implementation of the module-level `name`.
+
+    The default implementation is the one actually bound to `name` in the day
+    module; selecting a backend rebinds `name`, so calls pay nothing extra.
+    """
+
+    def decorator(func: F) -> F:
+        _variants.setdefault(func.__module__, {}).setdefault(name, {})[label] = func
+        if default:
+            _defaults.setdefault(func.__module__, {})[name] = label
+        return func
+
+    return decorator
+
+
+def variants(module: ModuleType) -> Dict[str, Dict[str, Callable]]:
+    return _variants.get(module.__name__, {})
+
+
+def backends_of(module: ModuleType) -> List[str]:
+    # Default backends first, then the alternatives in registration order
+    labels = list(dict.fromkeys(_defaults.get(module.__name__, {}).values()))
+    for implementations in variants(module).values():
+        labels.extend(label for label in implementations if label not in labels)
+    return labels
+
+
+def select_backend(module: ModuleType, label: Optional[str]) -> Dict[str, Callable]:
+    """Bind every name in `module` that has a `label` implementation to it.
+
+    Names without one keep their default. Returns the previous bindings.
+    """
+    previous = {}
+    for name, implementations in variants(module).items():
+        chosen = label if label is not None else _defaults.get(module.__name__, {}).get(name)
+        if chosen in implementations:
+            previous[name] = getattr(module, name)
+            setattr(module, name, implementations[chosen])
+    _clear_parse_cache(module)
+    return previous
+
+
+def _clear_parse_cache(module: ModuleType) -> None:
+    # parse() may itself call a swapped kernel
+    cache_clear = getattr(getattr(module, "parse", None), "cache_clear", None)
+    if cache_clear is not None:
+        cache_clear()
+
+
+def selected_backend() -> Optional[str]:
+    return os.environ.get(ENV_VAR) or None
+
+
+@contextmanager
+def using_backend(module: ModuleType, label: str) -> Iterator[None]:
+    # The environment variable carries the choice into subprocesses that inherit it;
+    # pyperf strips its workers' environment, so pyperf_bench passes it on explicitly
+    previous_env = os.environ.get(ENV_VAR)
+    os.environ[ENV_VAR] = label
+    previous = select_backend(module, label)
+    try:
+        yield
+    finally:
+        for name, func in previous.items():
+            setattr(module, name, func)
+        _clear_parse_cache(module)
+        if previous_env is None:
+            os.environ.pop(ENV_VAR, None)
+        else:
+            os.environ[ENV_VAR] = previous_env
@@ -0,0 +1,137 @@
+"""pytest plugin: per-part time and peak-memory budgets declared in day test files.
+
+A test file opts in with a module-level list::
+
+    BUDGETS = [
+        Budget("a", time_ms=1),
+        Budget("b", input="real", time_ms=250, peak_mb=20),
+    ]
+
+Each entry becomes a `budget[b-real]` test item, timed with the same sampler as
+`Aoc.analyze_performance` and with tracemalloc for the peak. `--budget=warn`
+turns failures into warnings and `--budget=off` deselects them.
+"""
+import re
+import warnings
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, Tuple
+
+import pytest
+
+TEST_FILE = re.compile(r"^(?P<year>\d{4})_day_(?P<day>\d{2})_test$")
+
+
+@dataclass(frozen=True)
+class Budget:
+    part: Literal["a", "b"]
+    input: Literal["sample", "real"] = "sample"
+    time_ms: Optional[float] = None
+    peak_mb: Optional[float] = None
+
+    @property
+    def id(self) -> str:
+        return f"{self.part}-{self.input}"
+
+
+class BudgetExceeded(pytest.PytestWarning):
+    pass
+
+
+class BudgetExceededError(AssertionError):
+    pass
+
+
+def pytest_addoption(parser: Any) -> None:
+    group = parser.getgroup("aoc budgets")
+    group.addoption("--budget", choices=("fail", "warn", "off"), default="fail",
+                    help="What an exceeded BUDGETS entry does (default: fail)")
+    group.addoption("--budget-time", type=float, default=0.5,
+                    help="Seconds of sampling per budget (default: 0.5)")
+
+
+def pytest_pycollect_makeitem(collector: Any, name: str, obj: Any) -> Optional[list]:
+    if name != "BUDGETS" or not isinstance(collector, pytest.Module):
+        return None
+    if collector.config.getoption("budget") == "off":
+        return []
+    return [BudgetItem.from_parent(collector, name=f"budget[{b.id}]", budget=b) for b in obj]
+
+
+class BudgetItem(pytest.Item):
+    def __init__(self, *, budget: Budget, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.budget = budget
+
+    def _day(self) -> Tuple[int, int]:
+        match = TEST_FILE.match(self.path.stem)
+        if match is None:
+            raise pytest.UsageError(f"{self.path.name}: BUDGETS needs a YYYY_day_DD_test.py file")
+        return int(match["year"]), int(match["day"])
+
+    def _data(self, year: int, day: int) -> str:
+        if self.budget.input == "sample":
+            module = self.getparent(pytest.Module)
+            assert module is not None  # only test modules collect BUDGETS
+            return module.obj.TEST_INPUT
+        from src.utils.input_store import get_input
+
+        try:
+            return get_input(year, day)
+        except Exception as e:
+            pytest.skip(f"real input for {year} day {day:02d} unavailable: {e}")
+
+    def runtest(self) -> None:
+        import sys
+
+        from src.utils.allocations import measure_allocations
+        from src.utils.memo import clear_memos
+        from src.utils.parsing import is_parse_hook
+        from src.utils.registry import default_registry
+        from src.utils.sampling import sample
+
+        year, day = self._day()
+        func = default_registry().parts(year, day)[self.budget.part]
+        data = self._data(year, day)
+
+        # Budgets cover the whole part, so the shared parse is redone and memo
+        # caches start empty every call; JIT compilation is not, hence one call
+        # before measuring
+        module = sys.modules[func.__module__]
+        parse_hook = getattr(module, "parse", None)
+
+        def setup() -> None:
+            if is_parse_hook(parse_hook):
+                parse_hook.cache_clear()
+            clear_memos(module)
+
+        func(data)
+
+        problems = []
+        if self.budget.time_ms is not None:
+            timing = sample(lambda: func(data), time_budget=self.config.getoption("budget_time"),
+                            max_samples=1_000, setup=setup)
+            self.user_properties.append(("time_ms", timing.mean_us / 1e3))
+            if timing.mean_us / 1e3 > self.budget.time_ms:
+                problems.append(f"time {timing.mean_us / 1e3:.3f}ms ± {timing.ci_us / 1e3:.3f} "
+                                f"> budget {self.budget.time_ms}ms")
+        if self.budget.peak_mb is not None:
+            setup()
+            stats, _ = measure_allocations(lambda: func(data), calls=1, top=0)
+            self.user_properties.append(("peak_mb", stats.peak_bytes / 2**20))
+            if stats.peak_bytes / 2**20 > self.budget.peak_mb:
+                problems.append(f"peak {stats.peak_bytes / 2**20:.2f}MB > budget {self.budget.peak_mb}MB")
+
+        if problems:
+            message = f"{year} day {day:02d} part {self.budget.part} ({self.budget.input}): " + "; ".join(problems)
+            if self.config.getoption("budget") == "warn":
+                warnings.warn(BudgetExceeded(message))
+            else:
+                raise BudgetExceededError(message)
+
+    def repr_failure(self, excinfo: Any, style: Any = None) -> Any:
+        if isinstance(excinfo.value, BudgetExceededError):
+            return str(excinfo.value)
+        return super().repr_failure(excinfo, style)
+
+    def reportinfo(self) -> Tuple[Any, None, str]:
+        return self.path, None, self.name
@@ -0,0 +1,149 @@
+import importlib
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from timeit import default_timer as timer
+from types import ModuleType
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from src.utils.shared_input import InputHandle
+
+
+@dataclass
+class SizeTiming:
+    n: int  # characters of input fed to the part
+    times_s: List[float]
+
+    @property
+    def best_s(self) -> float:
+        return min(self.times_s)
+
+
+@dataclass
+class ComplexityFit:
+    time_complexity: str
+    r_squared: float
+    confidence: float  # share of bootstrap resamples that pick the same class
+    runner_up: Optional[str]
+
+
+def _resolve(module_name: str, func_name: str) -> Tuple[Callable, ModuleType]:
+    from src.utils.backends import select_backend, selected_backend
+
+    module = importlib.import_module(module_name)
+    if label := selected_backend():
+        select_backend(module, label)
+    return getattr(module, func_name), module
+
+
+def measure_size(module_name: str, func_name: str, n: int, seed: int, n_timings: int, time_budget: float,
+                 shared: Optional["InputHandle"] = None, warmup: Optional[int] = None) -> SizeTiming:
+    """Time `func_name` on one input size; runs in its own worker process.
+
+    With `shared` the input is the first `n` bytes of that shared block (decoded
+    only for parts that need str), otherwise it is `generate(n, seed)` from the
+    day module. The parse and memo caches are cleared before every call so
+    every call is cold.
+    """
+    from src.utils.memo import clear_memos
+    from src.utils.parsing import is_parse_hook
+    from src.utils.shared_input import accepts_bytes, attach, input_for
+
+    func, module = _resolve(module_name, func_name)
+    if shared is not None:
+        view = attach(shared)
+        txt, warmup_txt = input_for(func, view, n), input_for(func, view, warmup)
+    else:
+        txt, warmup_txt = module.generate(n, seed), module.generate(n if warmup is None else warmup, seed)
+        if accepts_bytes(func):
+            txt, warmup_txt = memoryview(txt.encode()), memoryview(warmup_txt.encode())
+    parse_hook = getattr(module, "parse", None)
+    clear = parse_hook.cache_clear if is_parse_hook(parse_hook) else (lambda: None)
+
+    func(warmup_txt)  # JIT and first-import costs stay out of the timings
+    times = []
+    for _ in range(n_timings):
+        clear()
+        clear_memos(module)
+        start = timer()
+        func(txt)
+        times.append(timer() - start)
+        if times[-1] > time_budget:
+            break
+    return SizeTiming(n=len(txt), times_s=times)
+
+
+def sweep(func: Callable, sizes: Sequence[int], seed: int = 0, n_timings: int = 3, time_budget: float = 2.0,
+          data: Optional[str] = None, jobs: Optional[int] = None) -> List[SizeTiming]:
+    """Measure every size in a fresh worker process, largest sizes stopping the sweep.
+
+    Sizes start smallest first, at most `jobs` at a time (default 2, or 1 on one core). Once one
+    exceeds `time_budget` no larger size starts, but up to `jobs - 1` larger
+    ones may already be running, each stopping after its first call over the
+    budget. More jobs finish the sweep sooner and can overshoot it further.
+    With `data`, sizes are byte prefixes of it: it is placed in shared memory
+    once and each worker reads its prefix from there, instead of every task
+    pickling its own slice. Every size warms up on the smallest one.
+    """
+    from src.utils.shared_input import SharedInput
+
+    module_name, func_name = func.__module__, func.__name__
+    in_flight = max(1, min(jobs or min(2, os.cpu_count() or 1), len(sizes)))
+    queued = iter(sorted(sizes))
+    shared = SharedInput(data) if data is not None else None
+    handle = shared.handle if shared is not None else None
+    try:
+        # One task per worker keeps each size's heap, caches and JIT state separate
+        with ProcessPoolExecutor(max_workers=in_flight, max_tasks_per_child=1) as pool:
+            pending: Dict[Future, int] = {}
+            results = []
+            over_budget = False
+            while True:
+                while not over_budget and len(pending) < in_flight and (n := next(queued, None)) is not None:
+                    future = pool.submit(measure_size, module_name, func_name, n, seed, n_timings, time_budget,
+                                         handle, min(sizes))
+                    pending[future] = n
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    timing = future.result()
+                    results.append(timing)
+                    over_budget |= timing.best_s > time_budget
+    finally:
+        if shared is not None:
+            shared.close()
+    return sorted(results, key=lambda t: t.n)
+
+
+def fit(timings: List[SizeTiming], scale: float = 1.0, bootstrap: int = 200, seed: int = 0) -> ComplexityFit:
+    """Pick a big_o class from per-size timings.
+
+    R² is that of the chosen model's predictions. The confidence is how often
+    the same class wins when each size's time is redrawn from its own repeats.
+    """
+    import big_o
+    import numpy as np
+
+    ns = np.array([t.n for t in timings], dtype=float) / scale
+    times = np.array([t.best_s for t in timings])
+    best, fitted = big_o.infer_big_o_class(ns, times)
+    residuals = times - best.compute(ns)
+    total = np.sum((times - times.mean()) ** 2)
+    r_squared = float(1 - np.sum(residuals ** 2) / total) if total > 0 else 0.0
+    ranked = sorted(fitted.items(), key=lambda item: item[1])
+    runner_up = next((str(cls) for cls, _ in ranked if type(cls) is not type(best)), None)
+
+    rng = np.random.default_rng(seed)
+    agree = 0
+    for _ in range(bootstrap):
+        resampled = np.array([rng.choice(t.times_s) for t in timings])
+        agree += type(big_o.infer_big_o_class(ns, resampled)[0]) is type(best)
+    return ComplexityFit(
+        time_complexity=str(best),
+        r_squared=r_squared,
+        confidence=agree / bootstrap if bootstrap else 0.0,
+        runner_up=runner_up,
+    )
@@ -0,0 +1,171 @@
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.utils.paths import CACHE_DIR
+
+SOCKET_PATH = Path(os.environ.get("AOC_SOCKET", CACHE_DIR / "aoc.sock"))
+
+
+class SolveHandler(socketserver.StreamRequestHandler):
+    # One JSON request per line, one JSON response per line
+    server: "SolverServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    """Keeps the registry, inputs and compiled numba kernels warm between solves.
+
+    Requests are served one at a time so timings never overlap.
+    """
+
+    def __init__(self, path: Path = SOCKET_PATH):
+        self.path = Path(path)
+        self.started = time.time()
+        self.solved = 0
+        super().__init__(str(self.path), SolveHandler)
+
+    def server_bind(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if ping(self.path) is not None:
+                raise RuntimeError(f"a solver daemon is already listening on {self.path}")
+            self.path.unlink()
+        super().server_bind()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+    def warm(self, years: Optional[List[int]] = None) -> None:
+        from src.utils.input_store import get_input
+        from src.utils.jit import precompile_module
+        from src.utils.registry import default_registry
+
+        registry = default_registry()
+        for year, day in registry.days(years):
+            precompile_module(registry.entry(year, day).module)
+            try:
+                get_input(year, day)
+            except Exception:
+                pass
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op", "solve")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "uptime_s": time.time() - self.started, "solved": self.solved}
+        if op == "shutdown":
+            # shutdown() waits for serve_forever to return, which it cannot do
+            # while this handler runs
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "solve":
+            return {"ok": False, "error": f"unknown op {op!r}"}
+
+        from src.aoc import solve_cached
+        from src.utils.backends import using_backend
+        from src.utils.registry import default_registry
+
+        year, day = int(request["year"]), int(request["day"])
+        start = time.perf_counter()
+        if label := request.get("backend"):
+            with using_backend(default_registry().module(year, day), label):
+                (part_a, part_b), hits = solve_cached(year, day, use_cache=request.get("use_cache", True))
+        else:
+            (part_a, part_b), hits = solve_cached(year, day, use_cache=request.get("use_cache", True))
+        self.solved += 1
+        return {"ok": True, "part_a": part_a, "part_b": part_b, "cached": hits,
+                "solve_ms": (time.perf_counter() - start) * 1e3}
+
+
+def request(payload: Dict[str, Any], path: Path = SOCKET_PATH, timeout: Optional[float] = None) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+
+def ping(path: Path = SOCKET_PATH) -> Optional[Dict[str, Any]]:
+    try:
+        return request({"op": "ping"}, path, timeout=1.0)
+    except (OSError, ValueError):
+        return None
+
+
+def serve(years: Optional[List[int]] = None, warm: bool = True, path: Path = SOCKET_PATH) -> int:
+    server = SolverServer(path)
+
+    def interrupt(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, interrupt)
+    try:
+        if warm:
+            start = time.perf_counter()
+            server.warm(years)
+            print(f"warmed up in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        print(f"listening on {server.path} (pid {os.getpid()})", file=sys.stderr)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def stop(path: Path = SOCKET_PATH) -> int:
+    if ping(path) is None:
+        print(f"no solver daemon on {path}", file=sys.stderr)
+        return 1
+    request({"op": "shutdown"}, path, timeout=5.0)
+    return 0
+
+
+def solve(year: int, day: int, use_cache: bool = True, as_json: bool = False, backend: Optional[str] = None,
+          path: Path = SOCKET_PATH) -> int:
+    start = time.perf_counter()
+    try:
+        response = request({"op": "solve", "year": year, "day": day, "use_cache": use_cache, "backend": backend}, path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon: same answer, just without the warm process
+        from src.aoc import solve_cached
+
+        if backend:
+            os.environ["AOC_BACKEND"] = backend
+        print(f"no solver daemon on {path}, solving in-process", file=sys.stderr)
+        solve_start = time.perf_counter()
+        try:
+            (part_a, part_b), hits = solve_cached(year, day, use_cache=use_cache)
+            response = {"ok": True, "part_a": part_a, "part_b": part_b, "cached": hits,
+                        "solve_ms": (time.perf_counter() - solve_start) * 1e3}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    response["round_trip_ms"] = (time.perf_counter() - start) * 1e3
+
+    if as_json:
+        print(json.dumps(response))
+    elif response["ok"]:
+        print(f"part_a: {response['part_a']}")
+        print(f"part_b: {response['part_b']}")
+        print(f"solve {response['solve_ms']:.2f}ms, round trip {response['round_trip_ms']:.2f}ms"
+              f"{', cached' if response['cached'] else ''}", file=sys.stderr)
+    else:
+        print(response["error"], file=sys.stderr)
+    return 0 if response["ok"] else 1
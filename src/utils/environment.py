@@ -0,0 +1,180 @@
+import gc
+import os
+import platform
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from src.utils.history import git_revision, package_version
+
+CPU_SYSFS = Path("/sys/devices/system/cpu")
+
+
+@dataclass
+class Environment:
+    cpu_model: str
+    cores: int
+    usable_cores: List[int]  # this process's affinity, after any pinning
+    isolated_cores: List[int]
+    governor: Optional[str]  # None where cpufreq is not exposed (VMs, containers, macOS)
+    turbo: Optional[bool]
+    load: Tuple[float, float, float]
+    python: str
+    numba: Optional[str]
+    numpy: Optional[str]
+    git_rev: str
+    platform: str
+    stabilised: bool = False
+    warnings: List[str] = field(default_factory=list)
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def parse_cpu_list(text: Optional[str]) -> List[int]:
+    # Kernel cpulist format, e.g. "0-3,8,10-11"
+    cores: List[int] = []
+    for chunk in (text or "").split(","):
+        if not chunk.strip():
+            continue
+        first, _, last = chunk.partition("-")
+        cores.extend(range(int(first), int(last or first) + 1))
+    return cores
+
+
+def cpu_model() -> str:
+    for line in (_read(Path("/proc/cpuinfo")) or "").splitlines():
+        if line.startswith(("model name", "Hardware")):
+            return line.partition(":")[2].strip()
+    return platform.processor() or platform.machine()
+
+
+def usable_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def governors(cores: List[int]) -> List[str]:
+    found = (_read(CPU_SYSFS / f"cpu{core}" / "cpufreq" / "scaling_governor") for core in cores)
+    return sorted({governor for governor in found if governor})
+
+
+def turbo_enabled() -> Optional[bool]:
+    # intel_pstate says "no_turbo", acpi-cpufreq and amd-pstate say "boost"
+    no_turbo = _read(CPU_SYSFS / "intel_pstate" / "no_turbo")
+    if no_turbo is not None:
+        return no_turbo == "0"
+    boost = _read(CPU_SYSFS / "cpufreq" / "boost")
+    return boost == "1" if boost is not None else None
+
+
+def capture(stabilised: bool = False) -> Environment:
+    """What a benchmark ran on, cheap enough to take with every run."""
+    cores = usable_cores()
+    found = governors(cores)
+    env = Environment(
+        cpu_model=cpu_model(),
+        cores=os.cpu_count() or 1,
+        usable_cores=cores,
+        isolated_cores=parse_cpu_list(_read(CPU_SYSFS / "isolated")),
+        governor=",".join(found) or None,
+        turbo=turbo_enabled(),
+        load=os.getloadavg() if hasattr(os, "getloadavg") else (0.0, 0.0, 0.0),
+        python=sys.version.split()[0],
+        numba=package_version("numba"),
+        numpy=package_version("numpy"),
+        git_rev=git_revision(),
+        platform=platform.platform(),
+        stabilised=stabilised,
+    )
+    env.warnings = noise_sources(env)
+    return env
+
+
+def noise_sources(env: Environment) -> List[str]:
+    warnings = []
+    if env.governor and env.governor != "performance":
+        warnings.append(f"Frequency scaling active (governor {env.governor})")
+    if env.turbo:
+        warnings.append("Turbo boost enabled")
+    if env.load[0] > env.cores:
+        warnings.append(f"Load {env.load[0]:.1f} on {env.cores} cores")
+    if env.stabilised and not set(env.usable_cores) <= set(env.isolated_cores):
+        warnings.append("Pinned to cores the kernel does not isolate (no isolcpus)")
+    return warnings
+
+
+def stable_cores() -> List[int]:
+    # Isolated cores we may run on, else the last usable one (core 0 takes most interrupts)
+    cores = usable_cores()
+    isolated = [core for core in parse_cpu_list(_read(CPU_SYSFS / "isolated")) if core in cores]
+    return isolated or cores[-1:]
+
+
+@contextmanager
+def stabilised(cores: Optional[List[int]] = None) -> Iterator[Environment]:
+    """Pin this process, and every worker it spawns from here on, to quiet cores.
+
+    Affinity is inherited, so pyperf, isolated and pool workers started inside
+    the block run on the same cores. The environment yielded carries warnings
+    for what pinning cannot fix (frequency scaling, turbo, load).
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        env = capture(stabilised=True)
+        env.warnings.append("CPU pinning is not supported on this platform")
+        yield env
+        return
+
+    previous = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cores or stable_cores())
+    try:
+        yield capture(stabilised=True)
+    finally:
+        os.sched_setaffinity(0, previous)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    # Collect once and move what survives out of the collector's view, so no
+    # collection (or its cost over older objects) lands inside a timed region
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.freeze()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.unfreeze()
+        if enabled:
+            gc.enable()
+
+
+def run() -> int:
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    env = capture()
+    table = Table(box=box.ROUNDED, title="Benchmark Environment")
+    table.add_column("", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("CPU", env.cpu_model)
+    table.add_row("Cores", f"{len(env.usable_cores)} usable of {env.cores}"
+                  + (f", isolated {env.isolated_cores}" if env.isolated_cores else ""))
+    table.add_row("Governor", env.governor or "not exposed")
+    table.add_row("Turbo", {True: "on", False: "off", None: "not exposed"}[env.turbo])
+    table.add_row("Load", " ".join(f"{load:.2f}" for load in env.load))
+    table.add_row("Python", env.python)
+    table.add_row("numba / numpy", f"{env.numba} / {env.numpy}")
+    table.add_row("Revision", env.git_rev)
+    Console().print(table)
+    for warning in env.warnings:
+        Console().print(f"[yellow]⚠ {warning}")
+    return 0
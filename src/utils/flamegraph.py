@@ -0,0 +1,225 @@
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+from types import CodeType, FrameType, ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+
+Frame = Tuple[str, str, int]  # (name, file, line)
+Stack = Tuple[Frame, ...]
+
+
+@dataclass
+class FlameGraph:
+    name: str
+    samples: int
+    total_us: float
+    kernel_us: float = 0.0
+    top_frames: List[Tuple[str, float]] = field(default_factory=list)
+    speedscope_path: Optional[str] = None
+    collapsed_path: Optional[str] = None
+    stacks: Dict[Stack, float] = field(default_factory=dict)
+
+
+_code_keys: Dict[CodeType, Frame] = {}
+
+
+def _code_key(code: CodeType, name: Optional[str] = None) -> Frame:
+    # Memoised per code object: the sampler pauses the profiled thread while it
+    # walks, so every microsecond spent here lands in somebody's sample
+    try:
+        return _code_keys[code] if name is None else (name, *_code_keys[code][1:])
+    except KeyError:
+        pass
+    filename = code.co_filename
+    if filename.startswith(str(PROJECT_ROOT)):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    key = _code_keys[code] = (code.co_qualname, filename, code.co_firstlineno)
+    return key if name is None else (name, filename, code.co_firstlineno)
+
+
+THIS_FILE = _code_key(_code_key.__code__)[1]
+
+
+def _walk(frame: Optional[FrameType], stop: Optional[FrameType]) -> Stack:
+    stack = []
+    while frame is not None and frame is not stop:
+        stack.append(_code_key(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class Sampler(threading.Thread):
+    # Samples the target thread's Python stack from a side thread, weighting each
+    # sample by the wall time since the previous one. Time spent inside wrapped
+    # numba kernels is booked by the wrapper instead, because nopython code holds
+    # the GIL and the sampler cannot observe it
+    def __init__(self, target: int, root: Optional[FrameType], interval: float = 0.0005):
+        super().__init__(daemon=True)
+        self.target = target
+        self.root = root
+        self.interval = interval
+        self.stacks: Dict[Stack, float] = defaultdict(float)
+        self.samples = 0
+        self.kernel_us = 0.0
+        self._pending_kernel_us = 0.0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            now = time.perf_counter()
+            elapsed_us = (now - last) * 1e6 - self._pending_kernel_us
+            self._pending_kernel_us = 0.0
+            last = now
+            if frame is None or elapsed_us <= 0:
+                continue
+            stack = _walk(frame, self.root)
+            if stack:
+                self.stacks[stack] += elapsed_us
+                self.samples += 1
+
+    def book_kernel(self, stack: Stack, elapsed_us: float) -> None:
+        self.stacks[stack] += elapsed_us
+        self.kernel_us += elapsed_us
+        self._pending_kernel_us += elapsed_us
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def _wrap_kernel(sampler: Sampler, name: str, dispatcher: Any) -> Callable:
+    frame_key = _code_key(dispatcher.py_func.__code__, f"[numba] {name}")
+
+    def kernel_frame(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return dispatcher(*args, **kwargs)
+        finally:
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            sampler.book_kernel((*_walk(sys._getframe(1), sampler.root), frame_key), elapsed_us)
+
+    return kernel_frame
+
+
+class _FoldedKernels:
+    def __init__(self, sampler: Sampler, module: Optional[ModuleType]):
+        from src.utils.jit import module_kernels
+
+        self.module = module
+        self.kernels = module_kernels(module) if module is not None else []
+        self.sampler = sampler
+
+    def __enter__(self) -> "_FoldedKernels":
+        for name, dispatcher in self.kernels:
+            setattr(self.module, name, _wrap_kernel(self.sampler, name, dispatcher))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        for name, dispatcher in self.kernels:
+            setattr(self.module, name, dispatcher)
+
+
+def profile(func: Callable[[], Any], name: str, duration: float = 1.0, interval: float = 0.0005,
+            fold_kernels: bool = True, module: Optional[ModuleType] = None,
+            setup: Optional[Callable[[], None]] = None) -> FlameGraph:
+    """Sample `func` repeatedly for about `duration` seconds (at least one call).
+
+    With `fold_kernels`, the numba kernels in `module` are swapped for thin Python
+    wrappers for the duration, so their time shows up as `[numba] name` frames.
+    """
+    root = sys._getframe()
+    sampler = Sampler(threading.get_ident(), root, interval)
+    switch_interval = sys.getswitchinterval()
+    folded = _FoldedKernels(sampler, module if fold_kernels else None)
+
+    sys.setswitchinterval(min(switch_interval, interval))
+    start = time.perf_counter()
+    try:
+        with folded:
+            sampler.start()
+            while True:
+                if setup is not None:
+                    setup()
+                func()
+                if time.perf_counter() - start >= duration:
+                    break
+    finally:
+        sampler.stop()
+        sys.setswitchinterval(switch_interval)
+
+    # Drop samples of the profiler itself, the kernel wrappers and the lambda
+    # the harness wraps each part in
+    stacks: Dict[Stack, float] = defaultdict(float)
+    for stack, us in sampler.stacks.items():
+        if not stack or stack[0][1] == THIS_FILE:
+            continue
+        if stack[0][0] == "<lambda>":
+            stack = stack[1:]
+        stack = tuple(f for f in stack if f[1] != THIS_FILE)
+        if stack:
+            stacks[stack] += us
+
+    self_time: Dict[str, float] = defaultdict(float)
+    for stack, us in stacks.items():
+        self_time[f"{stack[-1][0]} ({stack[-1][1]}:{stack[-1][2]})"] += us
+    total_us = sum(stacks.values())
+    return FlameGraph(
+        name=name,
+        samples=sampler.samples,
+        total_us=total_us,
+        kernel_us=sampler.kernel_us,
+        top_frames=[(frame, us / total_us) for frame, us in heapq.nlargest(10, self_time.items(), key=itemgetter(1))] if total_us else [],
+        stacks=dict(stacks),
+    )
+
+
+def to_collapsed(stacks: Dict[Stack, float]) -> Iterator[str]:
+    # Brendan Gregg's folded format; weights are microseconds
+    for stack, us in sorted(stacks.items()):
+        yield ";".join(name for name, _, _ in stack) + f" {max(1, round(us))}"
+
+
+def to_speedscope(graph: FlameGraph) -> Dict[str, Any]:
+    frames: Dict[Frame, int] = {}
+    samples, weights = [], []
+    for stack, us in graph.stacks.items():
+        samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+        weights.append(round(us, 1))
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": graph.name,
+        "exporter": "aoc flamegraph",
+        "shared": {"frames": [{"name": name, "file": file, "line": line} for name, file, line in frames]},
+        "profiles": [{
+            "type": "sampled",
+            "name": graph.name,
+            "unit": "microseconds",
+            "startValue": 0,
+            "endValue": round(sum(weights), 1),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def write(graph: FlameGraph, directory: Path = PROFILE_DIR) -> FlameGraph:
+    directory.mkdir(parents=True, exist_ok=True)
+    speedscope = directory / f"{graph.name}.speedscope.json"
+    collapsed = directory / f"{graph.name}.collapsed"
+    speedscope.write_text(json.dumps(to_speedscope(graph)))
+    collapsed.write_text("\n".join(to_collapsed(graph.stacks)) + "\n")
+    graph.speedscope_path, graph.collapsed_path = str(speedscope), str(collapsed)
+    return graph
@@ -0,0 +1,236 @@
+import json
+import math
+import platform
+import sqlite3
+import subprocess
+from dataclasses import dataclass, field, is_dataclass
+from datetime import datetime
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional
+
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+HISTORY_PATH = CACHE_DIR / "history.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    git_rev TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    python TEXT NOT NULL,
+    numba TEXT,
+    mean_us REAL NOT NULL,
+    std_us REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    memory_peak REAL NOT NULL,
+    metrics TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (year, day, part, input_hash, id);
+"""
+
+# Fields that are not meaningful (or not serialisable) outside the process
+SKIP_FIELDS = {"result", "profile_stats", "fit_graph", "stacks", "functions"}
+
+
+@lru_cache(maxsize=None)
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--abbrev=12"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+@lru_cache(maxsize=None)
+def package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _to_json(value: Any) -> Any:
+    if is_dataclass(value):
+        return {k: _to_json(v) for k, v in vars(value).items() if k not in SKIP_FIELDS}
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def metrics_to_dict(metrics: Any) -> Dict[str, Any]:
+    return _to_json(metrics)
+
+
+@dataclass
+class Run:
+    id: int
+    timestamp: str
+    year: int
+    day: int
+    part: str
+    git_rev: str
+    input_hash: str
+    python: str
+    numba: Optional[str]
+    mean_us: float
+    std_us: float
+    samples: int
+    memory_peak: float
+    metrics: Dict[str, Any]
+
+
+@dataclass
+class Comparison:
+    baseline: Run
+    current: Run
+    time_change: float
+    p_value: float
+    memory_change: float
+    slower: bool
+    memory_growth: bool
+    environment_changes: List[str] = field(default_factory=list)
+
+    @property
+    def regressed(self) -> bool:
+        return self.slower or self.memory_growth
+
+
+class History:
+    def __init__(self, path: Path = HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def record(self, year: int, day: int, part: str, metrics: Any, input_hash: str) -> int:
+        data = metrics_to_dict(metrics)
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (timestamp, year, day, part, git_rev, input_hash, python, numba,"
+                " mean_us, std_us, samples, memory_peak, metrics) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now().isoformat(timespec="seconds"), year, day, part, git_revision(), input_hash,
+                    platform.python_version(), package_version("numba"),
+                    float(data["execution_time_us"]), float(data["time_std_us"]), int(data.get("iterations", 0)) - int(data.get("warmup_discarded", 0)),
+                    float(data["memory_peak"]), json.dumps(data),
+                ),
+            )
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def _run(self, row: sqlite3.Row) -> Run:
+        return Run(**{**dict(row), "metrics": json.loads(row["metrics"])})
+
+    def runs(self, year: Optional[int] = None, day: Optional[int] = None, part: Optional[str] = None) -> List[Run]:
+        clauses, params = [], []
+        for column, value in (("year", year), ("day", day), ("part", part)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [self._run(row) for row in self.db.execute(f"SELECT * FROM runs {where} ORDER BY id", params)]
+
+    def compare(self, years: Optional[List[int]] = None, baseline_rev: Optional[str] = None,
+                threshold: float = 0.05, alpha: float = 0.01) -> List[Comparison]:
+        latest: Dict[tuple, List[Run]] = {}
+        for run in self.runs():
+            if years and run.year not in years:
+                continue
+            latest.setdefault((run.year, run.day, run.part, run.input_hash), []).append(run)
+
+        comparisons = []
+        for runs in latest.values():
+            current = runs[-1]
+            if baseline_rev is None:
+                candidates = [r for r in runs[:-1] if r.git_rev != current.git_rev] or runs[:-1]
+            else:
+                candidates = [r for r in runs[:-1] if r.git_rev.startswith(baseline_rev)]
+            if candidates:
+                comparisons.append(compare_runs(candidates[-1], current, threshold, alpha))
+        return comparisons
+
+
+def welch_p_value(mean_a: float, std_a: float, n_a: int, mean_b: float, std_b: float, n_b: int) -> float:
+    # One-sided test that b is slower than a. Sample counts are in the tens to
+    # hundreds, so the normal approximation of Welch's t is close enough
+    if n_a < 2 or n_b < 2:
+        return 1.0
+    se = math.sqrt(std_a ** 2 / n_a + std_b ** 2 / n_b)
+    if se == 0:
+        return 0.0 if mean_b > mean_a else 1.0
+    return 1 - NormalDist().cdf((mean_b - mean_a) / se)
+
+
+# What has to match for two runs' timings to be comparable; older runs recorded none of it
+ENVIRONMENT_KEYS = ("cpu_model", "governor", "turbo", "python", "numba", "numpy", "stabilised")
+
+
+def environment_changes(baseline: Run, current: Run) -> List[str]:
+    before = baseline.metrics.get("environment") or {}
+    after = current.metrics.get("environment") or {}
+    if not before or not after:
+        return []
+    return [
+        f"{key} {before.get(key)} -> {after.get(key)}" for key in ENVIRONMENT_KEYS if before.get(key) != after.get(key)
+    ]
+
+
+def compare_runs(baseline: Run, current: Run, threshold: float = 0.05, alpha: float = 0.01) -> Comparison:
+    time_change = (current.mean_us - baseline.mean_us) / baseline.mean_us if baseline.mean_us else 0.0
+    p_value = welch_p_value(
+        baseline.mean_us, baseline.std_us, baseline.samples, current.mean_us, current.std_us, current.samples
+    )
+    memory_change = (
+        (current.memory_peak - baseline.memory_peak) / baseline.memory_peak if baseline.memory_peak > 0 else 0.0
+    )
+    return Comparison(
+        baseline=baseline,
+        current=current,
+        time_change=time_change,
+        p_value=p_value,
+        memory_change=memory_change,
+        slower=time_change > threshold and p_value < alpha,
+        memory_growth=memory_change > threshold and current.memory_peak - baseline.memory_peak > 1024 * 1024,
+        environment_changes=environment_changes(baseline, current),
+    )
+
+
+def print_comparisons(comparisons: List[Comparison]) -> int:
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(box=box.ROUNDED, title="Benchmark Comparison")
+    for column in ("Day", "Part", "Baseline", "Current", "Time", "p", "Memory", "Status"):
+        table.add_column(column)
+
+    for c in sorted(comparisons, key=lambda c: (c.current.year, c.current.day, c.current.part)):
+        status = "[red]REGRESSED" if c.regressed else "[green]ok"
+        table.add_row(
+            f"{c.current.year}/{c.current.day:02d}", c.current.part, c.baseline.git_rev, c.current.git_rev,
+            f"{c.time_change:+.1%}", f"{c.p_value:.3g}", f"{c.memory_change:+.1%}", status,
+        )
+
+    console = Console()
+    console.print(table)
+    for c in comparisons:
+        if c.environment_changes:
+            console.print(f"[yellow]{c.current.year}/{c.current.day:02d} {c.current.part} ran on a different setup: "
+                          f"{', '.join(c.environment_changes)}")
+    return 1 if any(c.regressed for c in comparisons) else 0
@@ -0,0 +1,95 @@
+import math
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from timeit import default_timer as timer
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.paths import PROJECT_ROOT
+
+IMPORT_LINE = re.compile(r"^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<indent>\s*)(?P<module>\S+)$")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    # Named like PerformanceMetrics so runs can go through History and `compare`
+    execution_time_us: float
+    time_std_us: float
+    iterations: int
+    wall_us: float
+    memory_peak: float = 0.0
+    top_imports: List[Tuple[str, int]] = field(default_factory=list)
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    cumulative = {}
+    for line in stderr.splitlines():
+        if match := IMPORT_LINE.match(line):
+            cumulative[match["module"]] = int(match["cumulative"])
+    return cumulative
+
+
+def measure_import(module: str) -> Tuple[Dict[str, int], float]:
+    start = timer()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr), (timer() - start) * 1e6
+
+
+def benchmark_import(year: int, day: int, repeat: int = 5, top: int = 5) -> ImportTiming:
+    module = f"src.aoc.aoc{year}.day_{day:02d}"
+    totals, walls = [], []
+    packages: Dict[str, List[int]] = {}
+    for _ in range(repeat):
+        cumulative, wall = measure_import(module)
+        totals.append(cumulative[module])
+        walls.append(wall)
+        for name, us in cumulative.items():
+            if "." not in name:
+                packages.setdefault(name, []).append(us)
+
+    mean = math.fsum(totals) / len(totals)
+    std = math.sqrt(math.fsum((t - mean) ** 2 for t in totals) / (len(totals) - 1)) if len(totals) > 1 else 0.0
+    heaviest = sorted(((name, min(us)) for name, us in packages.items()), key=lambda p: p[1], reverse=True)
+    return ImportTiming(
+        module=module,
+        execution_time_us=mean,
+        time_std_us=std,
+        iterations=repeat,
+        wall_us=math.fsum(walls) / len(walls),
+        top_imports=heaviest[:top],
+    )
+
+
+def run(years: Optional[List[int]] = None, repeat: int = 5, record: bool = False) -> int:
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.utils.history import History
+    from src.utils.runner import discover
+
+    history = History() if record else None
+    table = Table(box=box.ROUNDED, title="Day Module Import Time")
+    table.add_column("Day", style="cyan")
+    table.add_column("Import", style="green", justify="right")
+    table.add_column("Process", justify="right")
+    table.add_column("Heaviest imports")
+
+    for year, day in discover(years):
+        timing = benchmark_import(year, day, repeat)
+        table.add_row(
+            f"{year}/{day:02d}",
+            f"{timing.execution_time_us / 1e3:.1f}ms ± {timing.time_std_us / 1e3:.1f}",
+            f"{timing.wall_us / 1e3:.1f}ms",
+            ", ".join(f"{name} {us / 1e3:.1f}ms" for name, us in timing.top_imports),
+        )
+        if history is not None:
+            history.record(year, day, "import", timing, input_hash="")
+
+    Console().print(table)
+    return 0
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+STORE_DIR = CACHE_DIR / "inputs"
+# Moves the store, e.g. to a test's temporary directory; subprocesses inherit it
+STORE_ENV = "AOC_INPUT_STORE"
+FETCH_DIR = PROJECT_ROOT / "inputs"
+
+# fetch.sh writes inputs/NN.in for a single year
+FETCHED_INPUT = re.compile(r"^(?P<day>0[1-9]|1[0-9]|2[0-5])\.in$")
+
+
+def normalise(data: Union[str, bytes]) -> bytes:
+    # Match aocd, which strips the trailing newline from puzzle inputs
+    if isinstance(data, str):
+        data = data.encode()
+    return data.rstrip(b"\r\n")
+
+
+def input_hash(data: Union[str, bytes]) -> str:
+    return hashlib.sha256(normalise(data)).hexdigest()
+
+
+class InputStore:
+    """Content-addressed puzzle inputs stored as <root>/<year>/<day>/<sha256>.in."""
+
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self._index: Optional[Dict[str, str]] = None
+        self._views: Dict[Tuple[int, int], memoryview] = {}
+        self._text: Dict[Tuple[int, int], str] = {}
+
+    @staticmethod
+    def _key(year: int, day: int) -> str:
+        return f"{year}/{day:02d}"
+
+    @property
+    def index(self) -> Dict[str, str]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_path.read_text())
+            except FileNotFoundError:
+                self._index = {}
+        return self._index
+
+    def path(self, year: int, day: int, digest: str) -> Path:
+        return self.root / str(year) / f"{day:02d}" / f"{digest}.in"
+
+    def digest(self, year: int, day: int) -> Optional[str]:
+        return self.index.get(self._key(year, day))
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return self.digest(*key) is not None
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for key in sorted(self.index):
+            year, day = key.split("/")
+            yield int(year), int(day)
+
+    def view(self, year: int, day: int) -> Optional[memoryview]:
+        key = (year, day)
+        if key in self._views:
+            return self._views[key]
+        digest = self.digest(year, day)
+        if digest is None:
+            return None
+        with open(self.path(year, day, digest), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                view = memoryview(b"")
+            else:
+                view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        self._views[key] = view
+        return view
+
+    def get(self, year: int, day: int) -> Optional[str]:
+        key = (year, day)
+        if key not in self._text:
+            view = self.view(year, day)
+            if view is None:
+                return None
+            self._text[key] = str(view, "utf-8")
+        return self._text[key]
+
+    def put(self, year: int, day: int, data: Union[str, bytes]) -> str:
+        raw = normalise(data)
+        digest = hashlib.sha256(raw).hexdigest()
+        if self.digest(year, day) == digest:
+            return digest
+
+        path = self.path(year, day, digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(raw)
+            os.replace(tmp, path)
+
+        self.index[self._key(year, day)] = digest
+        self._save_index()
+        self._views.pop((year, day), None)
+        self._text.pop((year, day), None)
+        return digest
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.index, indent=2, sort_keys=True))
+        os.replace(tmp, self.index_path)
+
+    def ingest(self, directory: Path, year: int) -> Dict[int, str]:
+        ingested = {}
+        for path in sorted(Path(directory).iterdir()):
+            if match := FETCHED_INPUT.match(path.name):
+                day = int(match["day"])
+                ingested[day] = self.put(year, day, path.read_bytes())
+        return ingested
+
+
+_store: Optional[InputStore] = None
+
+
+def default_store() -> InputStore:
+    global _store
+    if _store is None:
+        _store = InputStore(Path(os.environ.get(STORE_ENV, STORE_DIR)))
+    return _store
+
+
+def get_input(year: int, day: int) -> str:
+    store = default_store()
+    data = store.get(year, day)
+    if data is None:
+        from aocd import get_data
+
+        store.put(year, day, get_data(day=day, year=year))
+        data = store.get(year, day)
+        assert data is not None
+    return data
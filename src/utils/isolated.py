@@ -0,0 +1,212 @@
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from timeit import default_timer as timer
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.paths import PROJECT_ROOT
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss() -> int:
+    # Linux keeps ru_maxrss across execve, so a child spawned by a large parent
+    # (pytest, a notebook) starts at the parent's size. VmHWM belongs to the
+    # child's own address space
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+@dataclass
+class ColdStart:
+    # Means over `iterations` fresh interpreters. The execution time is spawn to
+    # exit as seen by the parent, named like PerformanceMetrics so cold starts go
+    # through History and `compare` as their own part
+    execution_time_us: float
+    time_std_us: float
+    iterations: int
+    import_us: float
+    input_us: float
+    first_call_us: float
+    first_call_std_us: float
+    jit_compile_us: float
+    memory_peak: float = 0.0
+
+
+@dataclass
+class MemoryCeiling:
+    # High-water marks of a fresh process that imports the day, loads its input
+    # and solves one part; the largest over `runs` processes
+    peak_rss: float
+    call_rss: float  # how far the part itself raised the high-water mark
+    runs: int
+    samples: List[Tuple[float, int]]  # (ms since spawn, RSS) of the highest run, polled by the parent
+
+
+def _mean_std(values: List[float]) -> tuple:
+    mean = math.fsum(values) / len(values)
+    std = math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (len(values) - 1)) if len(values) > 1 else 0.0
+    return mean, std
+
+
+def run_isolated(year: int, day: int, part: str, timeout: float = 600.0,
+                 interval: Optional[float] = None) -> Dict[str, Any]:
+    """Solve one part in a fresh interpreter and return what the child measured.
+
+    With `interval`, the child's RSS is also polled every `interval` seconds
+    into `rss_samples`.
+    """
+    start = timer()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "src.utils.isolated", str(year), str(day), part],
+        cwd=PROJECT_ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    samples = _poll_rss(proc, start, interval, timeout) if interval else []
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
+    process_us = (timer() - start) * 1e6
+    if proc.returncode != 0:
+        raise RuntimeError(f"isolated run of {year} day {day:02d} part {part} failed:\n{stderr.strip()}")
+    return {**json.loads(stdout.splitlines()[-1]), "process_us": process_us, "rss_samples": samples}
+
+
+def _poll_rss(proc: subprocess.Popen, start: float, interval: float, timeout: float) -> List[Tuple[float, int]]:
+    import psutil
+
+    samples = []
+    try:
+        child = psutil.Process(proc.pid)
+        while proc.poll() is None and timer() - start < timeout:
+            rss = child.memory_info().rss
+            if rss:  # zero once the child is a zombie
+                samples.append(((timer() - start) * 1e3, rss))
+            time.sleep(interval)
+    except psutil.Error:
+        # Exited between poll() and memory_info()
+        pass
+    return samples
+
+
+def cold_start(year: int, day: int, part: str, runs: int = 3) -> ColdStart:
+    samples = [run_isolated(year, day, part) for _ in range(runs)]
+    process_us, process_std_us = _mean_std([s["process_us"] for s in samples])
+    first_call_us, first_call_std_us = _mean_std([s["first_call_us"] for s in samples])
+    return ColdStart(
+        execution_time_us=process_us,
+        time_std_us=process_std_us,
+        iterations=runs,
+        import_us=_mean_std([s["import_us"] for s in samples])[0],
+        input_us=_mean_std([s["input_us"] for s in samples])[0],
+        first_call_us=first_call_us,
+        first_call_std_us=first_call_std_us,
+        jit_compile_us=_mean_std([s["jit_compile_us"] for s in samples])[0],
+        memory_peak=max(s["maxrss"] for s in samples),
+    )
+
+
+def memory_ceiling(year: int, day: int, part: str, runs: int = 1, interval: float = 0.002) -> MemoryCeiling:
+    highest = max((run_isolated(year, day, part, interval=interval) for _ in range(runs)), key=lambda s: s["maxrss"])
+    # Polling also sees interpreter shutdown, which the child's own high-water mark cannot
+    polled = max((rss for _, rss in highest["rss_samples"]), default=0)
+    return MemoryCeiling(
+        peak_rss=max(highest["maxrss"], polled),
+        call_rss=highest["maxrss"] - highest["maxrss_before_call"],
+        runs=runs,
+        samples=[tuple(sample) for sample in highest["rss_samples"]],
+    )
+
+
+def run(years: Optional[List[int]] = None, runs: int = 1) -> int:
+    import psutil
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.aoc.aoc_helper import format_memory
+    from src.utils.registry import default_registry
+
+    console = Console()
+    registry = default_registry()
+    table = Table(box=box.ROUNDED, title="Peak RSS per Part (fresh process)")
+    table.add_column("Day", style="cyan")
+    table.add_column("Part")
+    table.add_column("Peak RSS", style="green", justify="right")
+    table.add_column("Raised by part", justify="right")
+    table.add_column("Samples", justify="right")
+
+    ceilings = []
+    for year, day in registry.days(years):
+        for part in registry.entry(year, day).parts:
+            try:
+                ceiling = memory_ceiling(year, day, part, runs=runs)
+            except RuntimeError as e:
+                console.print(f"[red]✗ {e}")
+                continue
+            ceilings.append(ceiling.peak_rss)
+            table.add_row(f"{year}/{day:02d}", part, format_memory(ceiling.peak_rss), format_memory(ceiling.call_rss),
+                          str(len(ceiling.samples)))
+
+    console.print(table)
+    if ceilings:
+        available = psutil.virtual_memory().available
+        jobs = max(1, min(os.cpu_count() or 1, int(available // max(ceilings))))
+        console.print(f"[cyan]{jobs} worker{'s' if jobs != 1 else ''} fit in {format_memory(available)} available "
+                      f"(largest part {format_memory(max(ceilings))})")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    # Child side: everything is timed from a bare interpreter, so only the
+    # stdlib is imported before the day module
+    args = argv or sys.argv[1:4]
+    year, day, part = int(args[0]), int(args[1]), args[2]
+
+    start = timer()
+    from src.utils.registry import default_registry
+
+    func = default_registry().parts(year, day)[part]
+    import_us = (timer() - start) * 1e6
+
+    start = timer()
+    from src.utils.shared_input import solver_input
+
+    data = solver_input(func, year, day)
+    input_us = (timer() - start) * 1e6
+
+    from src.utils.jit import record_compilation
+
+    maxrss_before_call = peak_rss()
+    with record_compilation() as compilation:
+        start = timer()
+        func(data)
+        first_call_us = (timer() - start) * 1e6
+
+    print(json.dumps({
+        "pid": os.getpid(),
+        "import_us": import_us,
+        "input_us": input_us,
+        "first_call_us": first_call_us,
+        "jit_compile_us": compilation.compile_us,
+        "maxrss_before_call": maxrss_before_call,
+        "maxrss": peak_rss(),
+    }))
+
+
+if __name__ == "__main__":
+    main()
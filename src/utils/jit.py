@@ -0,0 +1,121 @@
+import importlib
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from timeit import default_timer as timer
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+
+def kernel(*signatures: str, **options: Any) -> Callable:
+    """njit with on-disk caching. `signatures` are the argument types the solver
+    calls the kernel with; `python -m src precompile` compiles and caches them
+    ahead of time, while compilation stays lazy on import."""
+
+    def decorator(func: Callable) -> Any:
+        from numba import njit
+
+        options.setdefault("cache", True)
+        dispatcher = njit(**options)(func)
+        dispatcher.declared_signatures = signatures
+        return dispatcher
+
+    return decorator
+
+
+def is_kernel(obj: Any) -> bool:
+    numba = sys.modules.get("numba")
+    return numba is not None and isinstance(obj, numba.core.dispatcher.Dispatcher)
+
+
+def module_kernels(module: Any) -> List[Tuple[str, Any]]:
+    return [(name, obj) for name, obj in vars(module).items() if is_kernel(obj)]
+
+
+@dataclass
+class CompileTiming:
+    compile_us: float = 0.0
+    events: int = 0
+
+
+@contextmanager
+def record_compilation() -> Iterator[CompileTiming]:
+    # numba emits nested numba:compile events when kernels call kernels, so
+    # the total is the union of the outermost intervals
+    timing = CompileTiming()
+    if "numba" not in sys.modules:
+        yield timing
+        return
+
+    from numba.core import event
+
+    with event.install_recorder("numba:compile") as recorder:
+        yield timing
+
+    depth, start = 0, 0.0
+    for ts, ev in recorder.buffer:
+        if ev.is_start:
+            if depth == 0:
+                start = ts
+            depth += 1
+        elif ev.is_end:
+            depth -= 1
+            if depth == 0:
+                timing.compile_us += (ts - start) * 1e6
+                timing.events += 1
+
+
+def argument_types(signature: str) -> Tuple[Any, ...]:
+    # numba indexes its on-disk cache by whatever compile() was given, and calls
+    # look it up by the tuple of argument types, so a string would never be found
+    from numba.core.sigutils import normalize_signature
+
+    args, _ = normalize_signature(signature)
+    return tuple(args)
+
+
+@dataclass
+class PrecompileResult:
+    module: str
+    kernel: str
+    signatures: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def precompile_module(module_name: str) -> List[PrecompileResult]:
+    module = importlib.import_module(module_name)
+    results = []
+    for name, dispatcher in module_kernels(module):
+        result = PrecompileResult(module=module_name, kernel=name)
+        start = timer()
+        try:
+            for signature in getattr(dispatcher, "declared_signatures", ()):
+                dispatcher.compile(argument_types(signature))
+                result.signatures.append(signature)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+        result.seconds = timer() - start
+        results.append(result)
+    return results
+
+
+def run(years: Optional[List[int]] = None) -> int:
+    from rich.console import Console
+
+    from src.utils.runner import discover
+
+    console = Console()
+    failed = 0
+    for year, day in discover(years):
+        for result in precompile_module(f"src.aoc.aoc{year}.day_{day:02d}"):
+            if result.error:
+                failed += 1
+                console.print(f"[red]✗ {year}/{day:02d} {result.kernel}: {result.error}")
+            elif not result.signatures:
+                console.print(f"[yellow]? {year}/{day:02d} {result.kernel}: no declared signatures, compiles on first call")
+            else:
+                console.print(
+                    f"[green]✓ {year}/{day:02d} {result.kernel}[/green] "
+                    f"{', '.join(result.signatures)} [dim]{result.seconds:.2f}s[/dim]"
+                )
+    return 1 if failed else 0
@@ -0,0 +1,115 @@
+import inspect
+import json
+import linecache
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, List, Optional
+
+from src.utils.parsing import is_parse_hook
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+
+SKIPPED = {"main", "generate"}
+
+
+@dataclass
+class LineTiming:
+    function: str
+    line: int
+    hits: int
+    time_us: float
+    source: str
+
+
+@dataclass
+class FunctionLines:
+    name: str
+    filename: str
+    first_line: int
+    total_us: float
+    lines: List[LineTiming] = field(default_factory=list)
+
+
+@dataclass
+class LineProfile:
+    name: str
+    total_us: float
+    hot_lines: List[LineTiming] = field(default_factory=list)
+    functions: List[FunctionLines] = field(default_factory=list)
+    json_path: Optional[str] = None
+
+
+def module_functions(module: ModuleType) -> List[Callable]:
+    # Plain Python functions defined in the day file; parse_once hooks and spans
+    # are unwrapped so the parse body itself gets line timings
+    functions: List[Callable] = []
+    for name, obj in vars(module).items():
+        func = inspect.unwrap(obj) if callable(obj) else obj
+        if name not in SKIPPED and inspect.isfunction(func) and func.__code__.co_filename == module.__file__:
+            functions.append(func)
+    return functions
+
+
+def profile_lines(func: Callable[[str], Any], data: str, name: str, top: int = 15) -> LineProfile:
+    """Line-profile one call of a part together with every helper in its module."""
+    from line_profiler import LineProfiler
+
+    module = sys.modules[func.__module__]
+    profiler = LineProfiler()
+    for helper in module_functions(module):
+        profiler.add_function(helper)
+    if is_parse_hook(parse_hook := getattr(module, "parse", None)):
+        parse_hook.cache_clear()
+
+    profiler.enable_by_count()
+    try:
+        func(data)
+    finally:
+        profiler.disable_by_count()
+
+    stats = profiler.get_stats()
+    functions = []
+    for (filename, first_line, function), timings in stats.timings.items():
+        if not timings:
+            continue
+        lines = [
+            LineTiming(function=function, line=line, hits=hits, time_us=time * stats.unit * 1e6,
+                       source=linecache.getline(filename, line).strip())
+            for line, hits, time in timings
+        ]
+        functions.append(FunctionLines(
+            name=function,
+            filename=os.path.relpath(filename, PROJECT_ROOT) if filename.startswith(str(PROJECT_ROOT)) else filename,
+            first_line=first_line,
+            total_us=sum(line.time_us for line in lines),
+            lines=sorted(lines, key=lambda line: line.line),
+        ))
+
+    # Callers include their callees' time on the calling line, so the total is
+    # the part's own, not the sum over functions
+    total_us = max((f.total_us for f in functions), default=0.0)
+    all_lines = [line for f in functions for line in f.lines]
+    return LineProfile(
+        name=name,
+        total_us=total_us,
+        hot_lines=sorted(all_lines, key=lambda line: line.time_us, reverse=True)[:top],
+        functions=sorted(functions, key=lambda f: f.total_us, reverse=True),
+    )
+
+
+def write(profile: LineProfile, directory: Path = PROFILE_DIR) -> LineProfile:
+    from src.utils.history import metrics_to_dict
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{profile.name}.lines.json"
+    profile.json_path = str(path)
+    path.write_text(json.dumps(
+        {"name": profile.name, "total_us": profile.total_us,
+         "functions": [metrics_to_dict(f) for f in profile.functions]},
+        indent=2,
+    ))
+    return profile
@@ -0,0 +1,179 @@
+import hashlib
+import inspect
+import pickle
+import sqlite3
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar, Union, cast
+
+from src.utils.paths import CACHE_DIR
+
+F = TypeVar("F", bound=Callable)
+
+MEMO_PATH = CACHE_DIR / "memo.sqlite3"
+
+_KWARGS = object()
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_hits: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class DiskTier:
+    """Pickled results in SQLite, keyed by function, its source and the pickled arguments."""
+
+    def __init__(self, func: Callable, path: Path = MEMO_PATH):
+        self.path = Path(path)
+        # Editing the function gives it a new name here, so stale results are never read
+        source = hashlib.sha256(inspect.getsource(func).encode()).hexdigest()[:16]
+        self.name = f"{func.__module__}.{func.__qualname__}:{source}"
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memo (func TEXT NOT NULL, key BLOB NOT NULL, value BLOB NOT NULL,"
+                " PRIMARY KEY (func, key))"
+            )
+        return self._db
+
+    @staticmethod
+    def _key(key: Hashable) -> Optional[bytes]:
+        try:
+            return hashlib.sha256(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        if (digest := self._key(key)) is None:
+            return False, None
+        row = self.db.execute("SELECT value FROM memo WHERE func = ? AND key = ?", (self.name, digest)).fetchone()
+        return (True, pickle.loads(row[0])) if row else (False, None)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if (digest := self._key(key)) is None:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO memo VALUES (?, ?, ?)", (self.name, digest, blob))
+
+    def clear(self) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM memo WHERE func = ?", (self.name,))
+
+
+class MemoCache:
+    """Bounded LRU over a function's results, by entry count and/or (shallow) size in bytes."""
+
+    def __init__(self, maxsize: Optional[int] = 1024, max_bytes: Optional[int] = None,
+                 disk: Optional[DiskTier] = None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.data: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self.stats = MemoStats()
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = sys.getsizeof(value)
+        if key in self.data:
+            self.stats.entries -= 1
+            self.stats.bytes -= self.data[key][1]
+        self.data[key] = (value, size)
+        self.stats.entries += 1
+        self.stats.bytes += size
+        while self.data and ((self.maxsize is not None and self.stats.entries > self.maxsize)
+                             or (self.max_bytes is not None and self.stats.bytes > self.max_bytes)):
+            _, (_, evicted) = self.data.popitem(last=False)
+            self.stats.entries -= 1
+            self.stats.bytes -= evicted
+            self.stats.evictions += 1
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier (and with `disk`, the disk tier); counters start over."""
+        self.data.clear()
+        self.stats = MemoStats()
+        if disk and self.disk is not None:
+            self.disk.clear()
+
+
+def memoize(maxsize: Optional[int] = 1024, max_bytes: Optional[int] = None,
+            disk: Union[bool, Path] = False) -> Callable[[F], F]:
+    """Cache a pure function's results by its (hashable) arguments.
+
+    The cache is `func.cache`: `func.cache.stats` counts hits, misses and
+    evictions, `func.cache.clear()` empties it. With `disk=True` (or a path)
+    misses also look in `.cache/memo.sqlite3` and results are written through.
+    Results are shared, so callers must not mutate them.
+    """
+
+    def decorator(func: F) -> F:
+        tier = DiskTier(func, MEMO_PATH if disk is True else disk) if disk else None
+        cache = MemoCache(maxsize, max_bytes, tier)
+        data = cache.data  # cleared in place, never replaced
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            stats = cache.stats
+            key = (*args, _KWARGS, *sorted(kwargs.items())) if kwargs else args
+            try:
+                value, _ = data[key]
+            except KeyError:
+                pass
+            else:
+                data.move_to_end(key)
+                stats.hits += 1
+                return value
+
+            stats.misses += 1
+            if cache.disk is not None:
+                found, value = cache.disk.get(key)
+                if found:
+                    stats.disk_hits += 1
+                    cache.put(key, value)
+                    return value
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+            if cache.disk is not None:
+                cache.disk.put(key, value)
+            return value
+
+        setattr(wrapper, "cache", cache)
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def memo_caches(module: ModuleType) -> Dict[str, MemoCache]:
+    # Every memoized function in a day module, however it is bound (backends included)
+    from src.utils.backends import variants
+
+    functions = dict(vars(module))
+    for implementations in variants(module).values():
+        functions.update((getattr(impl, "__name__", label), impl) for label, impl in implementations.items())
+    return {name: obj.cache for name, obj in functions.items() if isinstance(getattr(obj, "cache", None), MemoCache)}
+
+
+def clear_memos(module: ModuleType) -> None:
+    for cache in memo_caches(module).values():
+        cache.clear()
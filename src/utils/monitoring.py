@@ -0,0 +1,223 @@
+import json
+import linecache
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from timeit import default_timer as timer
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.lineprof import module_functions
+from src.utils.parsing import is_parse_hook
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+
+monitoring = sys.monitoring
+EVENTS = {"calls": monitoring.events.PY_START, "lines": monitoring.events.LINE, "branches": monitoring.events.BRANCH}
+
+
+@dataclass
+class BranchCount:
+    line: int
+    target_line: int
+    count: int
+
+
+@dataclass
+class FunctionCounts:
+    name: str
+    filename: str
+    first_line: int
+    calls: int
+    lines: Dict[int, int] = field(default_factory=dict)
+    branches: List[BranchCount] = field(default_factory=list)
+
+
+@dataclass
+class MonitorCounts:
+    name: str
+    elapsed_us: float  # the monitored call, for comparing against an unmonitored one
+    events: int
+    functions: List[FunctionCounts] = field(default_factory=list)
+    json_path: Optional[str] = None
+
+
+def _code_objects(code: CodeType) -> Iterator[CodeType]:
+    # Lambdas, generator expressions and nested functions have their own code
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _code_objects(const)
+
+
+def _line_of(code: CodeType, offset: int) -> int:
+    for start, end, line in code.co_lines():
+        if start <= offset < end:
+            return line if line is not None else code.co_firstlineno
+    return code.co_firstlineno
+
+
+def _free_tool_id() -> int:
+    for tool in (monitoring.PROFILER_ID, monitoring.OPTIMIZER_ID, 3, 4):
+        if monitoring.get_tool(tool) is None:
+            return tool
+    raise RuntimeError("every sys.monitoring tool id is in use")
+
+
+def count(func: Callable[[str], Any], data: str, name: str, events: Iterable[str] = ("calls",)) -> MonitorCounts:
+    """Count calls, line executions and branch directions over one call of a part.
+
+    Events are enabled only on the day module's own code objects (PEP 669 local
+    events), so library and numba code runs without any callback at all. Each
+    counted event is still a Python callback, so only "calls", much cheaper
+    than cProfile, is on by default; on loop-heavy code "lines" and "branches"
+    cost more than cProfile.
+    """
+    selected = [EVENTS[event] for event in events]
+    module = sys.modules[func.__module__]
+    codes = [code for helper in module_functions(module) for code in _code_objects(helper.__code__)]
+    # Keyed by id(): hashing a code object hashes its bytecode and constants
+    by_id = {id(code): code for code in codes}
+    calls: Dict[int, int] = defaultdict(int)
+    lines: Dict[Tuple[int, int], int] = defaultdict(int)
+    branches: Dict[Tuple[int, int, int], int] = defaultdict(int)
+
+    def on_start(code: CodeType, offset: int) -> None:
+        calls[id(code)] += 1
+
+    def on_line(code: CodeType, line: int) -> None:
+        lines[id(code), line] += 1
+
+    def on_branch(code: CodeType, offset: int, destination: int) -> None:
+        branches[id(code), offset, destination] += 1
+
+    if is_parse_hook(parse_hook := getattr(module, "parse", None)):
+        parse_hook.cache_clear()
+
+    tool = _free_tool_id()
+    monitoring.use_tool_id(tool, "aoc-monitor")
+    try:
+        callbacks: Tuple[Callable[..., None], ...] = (on_start, on_line, on_branch)
+        for event, callback in zip(EVENTS.values(), callbacks):
+            if event in selected:
+                monitoring.register_callback(tool, event, callback)
+        for code in codes:
+            monitoring.set_local_events(tool, code, sum(selected))
+        start = timer()
+        func(data)
+        elapsed_us = (timer() - start) * 1e6
+    finally:
+        for code in codes:
+            monitoring.set_local_events(tool, code, 0)
+        for event in selected:
+            monitoring.register_callback(tool, event, None)
+        monitoring.free_tool_id(tool)
+
+    per_code: Dict[CodeType, FunctionCounts] = {}
+
+    def counts_for(code: CodeType) -> FunctionCounts:
+        if code not in per_code:
+            filename = code.co_filename
+            per_code[code] = FunctionCounts(
+                name=code.co_qualname,
+                filename=os.path.relpath(filename, PROJECT_ROOT) if filename.startswith(str(PROJECT_ROOT)) else filename,
+                first_line=code.co_firstlineno,
+                calls=calls.get(id(code), 0),
+            )
+        return per_code[code]
+
+    for code_id in calls:
+        counts_for(by_id[code_id])
+    for (code_id, line), hits in lines.items():
+        counts_for(by_id[code_id]).lines[line] = hits
+    for (code_id, offset, destination), hits in branches.items():
+        code = by_id[code_id]
+        counts_for(code).branches.append(BranchCount(_line_of(code, offset), _line_of(code, destination), hits))
+    for counts in per_code.values():
+        counts.lines = dict(sorted(counts.lines.items()))
+        counts.branches.sort(key=lambda b: (b.line, b.target_line))
+
+    return MonitorCounts(
+        name=name,
+        elapsed_us=elapsed_us,
+        events=sum(calls.values()) + sum(lines.values()) + sum(branches.values()),
+        functions=sorted(per_code.values(), key=lambda f: sum(f.lines.values()), reverse=True),
+    )
+
+
+def write(counts: MonitorCounts, directory: Path = PROFILE_DIR) -> MonitorCounts:
+    from src.utils.history import metrics_to_dict
+
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{counts.name}.monitor.json"
+    counts.json_path = str(path)
+    path.write_text(json.dumps(metrics_to_dict(counts), indent=2))
+    return counts
+
+
+def _time_call(func: Callable[[str], Any], data: str, module: ModuleType, profiled: bool = False) -> float:
+    if is_parse_hook(parse_hook := getattr(module, "parse", None)):
+        parse_hook.cache_clear()
+    if profiled:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        start = timer()
+        profiler.runcall(func, data)
+        return (timer() - start) * 1e6
+    start = timer()
+    func(data)
+    return (timer() - start) * 1e6
+
+
+def run(year: int, day: int, parts: Optional[List[str]] = None, events: Iterable[str] = ("calls",),
+        top: int = 15) -> int:
+    from rich import box
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    from src.utils.input_store import get_input
+    from src.utils.registry import default_registry
+
+    console = Console()
+    data = get_input(year, day)
+    module = default_registry().module(year, day)
+    for part, func in default_registry().parts(year, day).items():
+        if parts and part not in parts:
+            continue
+        func(data)  # imports, JIT and caches stay out of every timing below
+        plain_us = _time_call(func, data, module)
+        profiled_us = _time_call(func, data, module, profiled=True)
+        counts = write(count(func, data, f"{year}_day_{day:02d}_{part}", events))
+        assert counts.json_path is not None
+
+        if any(f.lines for f in counts.functions):
+            hot = sorted(
+                ((f, line, hits) for f in counts.functions for line, hits in f.lines.items()),
+                key=lambda item: item[2], reverse=True,
+            )[:top]
+            table = Table(box=box.ROUNDED, title=f"Part {part.upper()} Line Counts ({counts.events:,} events)")
+            table.add_column("Location", style="cyan", no_wrap=True)
+            table.add_column("Hits", style="green", justify="right", no_wrap=True)
+            table.add_column("Branches", justify="right", no_wrap=True)
+            table.add_column("Source")
+            for f, line, hits in hot:
+                taken = ", ".join(f"→{b.target_line} {b.count:,}" for b in f.branches if b.line == line)
+                source = linecache.getline(str(PROJECT_ROOT / f.filename), line).strip()
+                table.add_row(f"{f.name}:{line}", f"{hits:,}", taken, escape(source))
+        else:
+            table = Table(box=box.ROUNDED, title=f"Part {part.upper()} Call Counts ({counts.events:,} events)")
+            table.add_column("Function", style="cyan")
+            table.add_column("Calls", style="green", justify="right")
+            for f in sorted(counts.functions, key=lambda f: f.calls, reverse=True)[:top]:
+                table.add_row(f"{f.name} ({f.filename}:{f.first_line})", f"{f.calls:,}")
+        console.print(table)
+        console.print(
+            f"[dim]one call: {plain_us / 1e3:.2f}ms plain, {counts.elapsed_us / 1e3:.2f}ms monitored, "
+            f"{profiled_us / 1e3:.2f}ms under cProfile; counts in {os.path.relpath(counts.json_path, PROJECT_ROOT)}"
+        )
+    return 0
@@ -0,0 +1,47 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Protocol, TypeGuard, TypeVar, cast
+
+K = TypeVar("K", bound=Hashable)  # the input: str, or a read-only bytes view
+T = TypeVar("T")
+
+
+class ParseHook(Protocol[K, T]):
+    # What parse_once adds to the function it wraps
+    parse_once: bool
+    uncached: Callable[[K], T]
+    cache_clear: Callable[[], None]
+
+    def __call__(self, txt: K) -> T: ...
+
+
+def parse_once(func: Callable[[K], T], maxsize: int = 8) -> ParseHook[K, T]:
+    """Memoise a day's parse(txt) per input so part_a and part_b share one parse.
+
+    The cache is keyed by the input string itself: str caches its hash, so a
+    repeat lookup costs one dict probe rather than re-hashing the whole input.
+    Parts must treat the result as read-only (copy before mutating).
+    """
+    cache: OrderedDict[K, T] = OrderedDict()
+
+    @wraps(func)
+    def wrapper(txt: K) -> T:
+        try:
+            value = cache[txt]
+        except KeyError:
+            value = cache[txt] = func(txt)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return value
+        cache.move_to_end(txt)
+        return value
+
+    hook = cast(ParseHook[K, T], wrapper)
+    hook.parse_once = True
+    hook.uncached = func
+    hook.cache_clear = cache.clear
+    return hook
+
+
+def is_parse_hook(func: object) -> TypeGuard[ParseHook[Any, Any]]:
+    return callable(func) and getattr(func, "parse_once", False)
@@ -0,0 +1,5 @@
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+# Inputs, answers, history, profiles and the registry index all live under here
+CACHE_DIR = PROJECT_ROOT / ".cache"
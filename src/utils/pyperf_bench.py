@@ -0,0 +1,67 @@
+from pathlib import Path
+from typing import Optional
+
+import pyperf
+
+from src.utils.backends import ENV_VAR as BACKEND_ENV
+from src.utils.environment import capture
+from src.utils.history import git_revision
+from src.utils.input_store import STORE_ENV, get_input, input_hash
+from src.utils.paths import CACHE_DIR
+from src.utils.registry import default_registry
+from src.utils.shared_input import solver_input
+
+PYPERF_DIR = CACHE_DIR / "pyperf"
+
+MODE_FLAGS = {
+    "quick": ["--fast"],
+    "normal": [],
+    "accurate": ["--rigorous"],
+}
+
+# pyperf starts its workers with little more than PATH, HOME and PYTHON*; these
+# carry the harness's configuration (selected backend, a relocated input store, the
+# result cache) into them
+INHERITED_ENV = [BACKEND_ENV, STORE_ENV, "AOC_RESULT_CACHE"]
+
+
+def benchmark_name(year: int, day: int, part: str) -> str:
+    return f"{year}_day_{day:02d}_{part}"
+
+
+def output_path(year: int, day: int, part: str, revision: Optional[str] = None) -> Path:
+    # One directory per revision, so `pyperf compare_to old/x.json new/x.json` works across commits
+    return PYPERF_DIR / (revision or git_revision()) / f"{benchmark_name(year, day, part)}.json"
+
+
+def _add_cmdline_args(cmd: list, args) -> None:
+    cmd.extend((str(args.year), str(args.day), args.part))
+
+
+def main() -> None:
+    # Workers are re-spawned as `python -m src.utils.pyperf_bench ...` from the project root
+    runner = pyperf.Runner(program_args=("-m", "src.utils.pyperf_bench"), add_cmdline_args=_add_cmdline_args)
+    runner.argparser.add_argument("year", type=int)
+    runner.argparser.add_argument("day", type=int)
+    runner.argparser.add_argument("part", choices=("a", "b"))
+    args = runner.parse_args()
+    args.inherit_environ = [*(args.inherit_environ or []), *INHERITED_ENV]
+
+    func = default_registry().parts(args.year, args.day)[args.part]
+    data = solver_input(func, args.year, args.day)
+
+    runner.metadata["aoc_git_revision"] = git_revision()
+    runner.metadata["aoc_input_hash"] = input_hash(get_input(args.year, args.day))
+    # What the selected backend bound the part to, as each worker saw it
+    runner.metadata["aoc_solver"] = func.__name__
+    # pyperf records the CPU model, frequencies and load itself; add what it does not
+    environment = capture()
+    runner.metadata["aoc_governor"] = environment.governor or "n/a"
+    runner.metadata["aoc_turbo"] = str(environment.turbo)
+    runner.metadata["aoc_numba"] = environment.numba or "n/a"
+    runner.metadata["aoc_numpy"] = environment.numpy or "n/a"
+    runner.bench_func(benchmark_name(args.year, args.day, args.part), func, data)
+
+
+if __name__ == "__main__":
+    main()
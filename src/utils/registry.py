@@ -0,0 +1,198 @@
+import importlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.backends import select_backend, selected_backend
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+if TYPE_CHECKING:
+    import ast
+
+    from src.utils.shared_input import Input
+
+AOC_DIR = PROJECT_ROOT / "src" / "aoc"
+REGISTRY_PATH = CACHE_DIR / "registry.json"
+
+YEAR_DIR = re.compile(r"^aoc(?P<year>\d{4})$")
+DAY_FILE = re.compile(r"^day_(?P<day>\d{2})\.py$")
+
+PARTS = ("a", "b")
+
+
+@dataclass
+class SolverEntry:
+    year: int
+    day: int
+    module: str
+    path: str
+    parts: List[str] = field(default_factory=list)
+    parse: bool = False
+    generate: bool = False
+    kernels: List[str] = field(default_factory=list)
+    mtime_ns: int = 0
+
+
+def _decorator_name(node: "ast.expr") -> str:
+    import ast
+
+    if isinstance(node, ast.Call):
+        node = node.func
+    return node.attr if isinstance(node, ast.Attribute) else getattr(node, "id", "")
+
+
+def scan_day(year: int, day: int, path: Path) -> SolverEntry:
+    # Read from source so building the index never imports numba/numpy; ast
+    # itself is only needed when a day file changed
+    import ast
+
+    entry = SolverEntry(year=year, day=day, module=f"src.aoc.aoc{year}.day_{day:02d}", path=str(path),
+                        mtime_ns=path.stat().st_mtime_ns)
+    for node in ast.parse(path.read_bytes(), filename=str(path)).body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        decorators = {_decorator_name(d) for d in node.decorator_list}
+        if node.name in (f"part_{p}" for p in PARTS):
+            entry.parts.append(node.name[-1])
+        elif node.name == "parse" and "parse_once" in decorators:
+            entry.parse = True
+        elif node.name == "generate":
+            entry.generate = True
+        if decorators & {"kernel", "njit", "jit"}:
+            entry.kernels.append(node.name)
+    return entry
+
+
+class Registry:
+    """Index of (year, day) -> solver module, built from source and cached as JSON.
+
+    Revalidating the cache costs one stat per day file and year directory, so
+    lookups never import anything until a day's parts are actually loaded.
+    """
+
+    def __init__(self, aoc_dir: Path = AOC_DIR, path: Path = REGISTRY_PATH):
+        self.aoc_dir = aoc_dir
+        self.path = path
+        self._entries: Optional[Dict[Tuple[int, int], SolverEntry]] = None
+        self._by_path: Dict[str, SolverEntry] = {}
+        self._modules: Dict[Tuple[int, int], ModuleType] = {}
+
+    @property
+    def entries(self) -> Dict[Tuple[int, int], SolverEntry]:
+        if self._entries is None:
+            cached = self._load_cache()
+            if cached is None:
+                cached = self.build()
+            self._entries = cached
+        return self._entries
+
+    def _year_dirs(self) -> Iterator[Tuple[int, Path]]:
+        for year_dir in self.aoc_dir.iterdir():
+            if (match := YEAR_DIR.match(year_dir.name)) and year_dir.is_dir():
+                yield int(match["year"]), year_dir
+
+    def _load_cache(self) -> Optional[Dict[Tuple[int, int], SolverEntry]]:
+        try:
+            cache = json.loads(self.path.read_text())
+            if cache["aoc_dir"] != str(self.aoc_dir):
+                return None
+            # A day file added or removed bumps its year directory's mtime
+            if any(os.stat(d).st_mtime_ns != mtime for d, mtime in cache["dirs"].items()):
+                return None
+            entries = [SolverEntry(**e) for e in cache["entries"]]
+            if any(os.stat(e.path).st_mtime_ns != e.mtime_ns for e in entries):
+                return None
+        except (OSError, KeyError, TypeError, json.JSONDecodeError):
+            return None
+        return {(e.year, e.day): e for e in entries}
+
+    def build(self) -> Dict[Tuple[int, int], SolverEntry]:
+        entries, dirs = {}, {}
+        for year, year_dir in self._year_dirs():
+            dirs[str(year_dir)] = year_dir.stat().st_mtime_ns
+            for f in year_dir.iterdir():
+                if match := DAY_FILE.match(f.name):
+                    entry = scan_day(year, int(match["day"]), f)
+                    entries[(entry.year, entry.day)] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "aoc_dir": str(self.aoc_dir),
+            "dirs": dirs,
+            "entries": [asdict(e) for _, e in sorted(entries.items())],
+        }, indent=2))
+        os.replace(tmp, self.path)
+
+        self._entries = entries
+        self._by_path.clear()
+        self._modules.clear()
+        return entries
+
+    def get(self, year: int, day: int) -> Optional[SolverEntry]:
+        return self.entries.get((year, day))
+
+    def entry(self, year: int, day: int) -> SolverEntry:
+        # Like get(), but a missing day is an error rather than None
+        entry = self.get(year, day)
+        if entry is None:
+            raise LookupError(f"no solver registered for {year} day {day:02d}")
+        return entry
+
+    def days(self, years: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+        wanted = set(years) if years else None
+        return sorted(key for key in self.entries if wanted is None or key[0] in wanted)
+
+    def day_of(self, filename: str) -> int:
+        if not self._by_path:
+            self._by_path = {entry.path: entry for entry in self.entries.values()}
+        entry = self._by_path.get(filename) or self._by_path.get(str(Path(filename).resolve()))
+        if entry is None:
+            raise LookupError(f"{filename} is not a registered day module")
+        return entry.day
+
+    def module(self, year: int, day: int) -> ModuleType:
+        try:
+            return self._modules[(year, day)]
+        except KeyError:
+            pass
+        module = self._modules[(year, day)] = importlib.import_module(self.entry(year, day).module)
+        if label := selected_backend():
+            select_backend(module, label)
+        return module
+
+    def parts(self, year: int, day: int) -> Dict[str, Callable[["Input"], object]]:
+        entry, module = self.entry(year, day), self.module(year, day)
+        return {part: getattr(module, f"part_{part}") for part in entry.parts}
+
+
+_registry: Optional[Registry] = None
+
+
+def default_registry() -> Registry:
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+    return _registry
+
+
+def run(years: Optional[List[int]] = None) -> int:
+    from rich import box
+    from rich.console import Console
+    from rich.table import Table
+
+    registry = default_registry()
+    registry.build()
+    table = Table(box=box.ROUNDED, title=f"Solver Registry ({registry.path.relative_to(PROJECT_ROOT)})")
+    for column in ("Day", "Module", "Parts", "Parse", "Generate", "Kernels"):
+        table.add_column(column, style="cyan" if column == "Day" else None)
+    for year, day in registry.days(years):
+        entry = registry.entry(year, day)
+        table.add_row(f"{year}/{day:02d}", entry.module, " ".join(entry.parts), "✓" if entry.parse else "",
+                      "✓" if entry.generate else "", ", ".join(entry.kernels))
+    Console().print(table)
+    return 0
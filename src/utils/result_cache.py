@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.utils.paths import CACHE_DIR, PROJECT_ROOT
+
+RESULTS_PATH = CACHE_DIR / "results.sqlite3"
+MAX_ENTRIES = 4096
+
+Answer = Optional[Union[int, str]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    part TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    elapsed_s REAL NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (year, day, part, input_hash, source_hash)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+# `import src.x` / `from src.x import y`; matched as text so a cache hit never parses
+# Python. Compiled (and cached by re) on first use rather than on import
+IMPORT = (r"^(?P<indent>[ \t]*)(?:from\s+(?P<package>src(?:\.\w+)*)\s+import\s+(?P<names>[\w ,()]+)"
+          r"|import\s+(?P<module>src(?:\.\w+)*))")
+
+# path -> ((mtime_ns, size), sha256, (indent, src module) for each import)
+_scanned: Dict[Path, Tuple[Tuple[int, int], str, List[Tuple[str, str]]]] = {}
+
+
+def module_path(name: str) -> Optional[Path]:
+    base = PROJECT_ROOT.joinpath(*name.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _scan(path: Path, nested: bool) -> Tuple[str, List[str]]:
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    if path not in _scanned or _scanned[path][0] != key:
+        text = path.read_bytes()
+        imports: List[Tuple[str, str]] = []
+        for match in re.finditer(IMPORT, text.decode("utf-8", "replace"), re.MULTILINE):
+            if match["module"]:
+                imports.append((match["indent"], match["module"]))
+            else:
+                imports.append((match["indent"], match["package"]))
+                # `from src.utils import parsing` imports a module too
+                names = match["names"].replace("(", " ").replace(")", " ").split(",")
+                imports.extend((match["indent"], f"{match['package']}.{name.split()[0]}") for name in names
+                               if name.split())
+        _scanned[path] = (key, hashlib.sha256(text).hexdigest(), imports)
+    _, digest, imports = _scanned[path]
+    return digest, [name for indent, name in imports if nested or not indent]
+
+
+def source_hash(path: Union[str, Path]) -> str:
+    """Hash of a day file and every src module it depends on.
+
+    Follows all `src` imports in the day file and module-level ones in what it
+    imports, so editing a shared helper (parsing, jit, backends) also misses the
+    cache. Files are re-read only when their mtime or size changes.
+    """
+    root = Path(path).resolve()
+    seen: Dict[Path, str] = {}
+    todo = [(root, True)]
+    while todo:
+        current, nested = todo.pop()
+        if current in seen:
+            continue
+        seen[current], imports = _scan(current, nested)
+        todo.extend((found, False) for name in imports if (found := module_path(name)) is not None)
+    digest = hashlib.sha256()
+    for current in sorted(seen):
+        digest.update(f"{current.relative_to(PROJECT_ROOT)}:{seen[current]}\n".encode())
+    return digest.hexdigest()
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("AOC_RESULT_CACHE", "1") not in ("0", "false", "no")
+
+
+@dataclass
+class CachedResult:
+    answer: Answer
+    elapsed_s: float
+
+
+class ResultCache:
+    """Answers keyed by (year, day, part, input hash, day module source hash).
+
+    Editing a day file or changing its input gives a new key, so stale rows are
+    never read; they are evicted least-recently-used once `max_entries` is hit.
+    """
+
+    def __init__(self, path: Path = RESULTS_PATH, max_entries: int = MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        import sqlite3
+
+        # Batch runs write from several worker processes
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def get(self, year: int, day: int, part: str, input_hash: str, source_hash: str) -> Optional[CachedResult]:
+        key = (year, day, part, input_hash, source_hash)
+        row = self.db.execute(
+            "SELECT answer, elapsed_s FROM results"
+            " WHERE year = ? AND day = ? AND part = ? AND input_hash = ? AND source_hash = ?", key,
+        ).fetchone()
+        if row is None:
+            return None
+        with self.db:
+            self.db.execute(
+                "UPDATE results SET last_used = ?"
+                " WHERE year = ? AND day = ? AND part = ? AND input_hash = ? AND source_hash = ?", (time.time(), *key),
+            )
+        return CachedResult(answer=json.loads(row[0]), elapsed_s=row[1])
+
+    def put(self, year: int, day: int, part: str, input_hash: str, source_hash: str, answer: Answer,
+            elapsed_s: float) -> None:
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (year, day, part, input_hash, source_hash, json.dumps(answer), elapsed_s, now, now),
+            )
+            self.db.execute(
+                "DELETE FROM results WHERE rowid NOT IN"
+                " (SELECT rowid FROM results ORDER BY last_used DESC LIMIT ?)", (self.max_entries,),
+            )
+
+    def clear(self, years: Optional[List[int]] = None) -> int:
+        with self.db:
+            if years:
+                cursor = self.db.execute(
+                    f"DELETE FROM results WHERE year IN ({', '.join('?' * len(years))})", years
+                )
+            else:
+                cursor = self.db.execute("DELETE FROM results")
+        return cursor.rowcount
+
+    def stats(self) -> Tuple[int, float]:
+        count, saved = self.db.execute("SELECT COUNT(*), COALESCE(SUM(elapsed_s), 0) FROM results").fetchone()
+        return count, saved
+
+
+_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
+
+
+def run(clear: bool = False, years: Optional[List[int]] = None) -> int:
+    cache = default_cache()
+    if clear:
+        print(f"removed {cache.clear(years)} cached answers")
+        return 0
+    count, saved = cache.stats()
+    print(f"{count} cached answers in {cache.path.relative_to(PROJECT_ROOT)} ({saved:.2f}s of solving)")
+    return 0
@@ -0,0 +1,103 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.paths import CACHE_DIR
+
+TIMINGS_PATH = CACHE_DIR / "runner_timings.json"
+
+
+@dataclass
+class DayResult:
+    year: int
+    day: int
+    part_a: Any = None
+    part_b: Any = None
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+
+
+def discover(years: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+    from src.utils.registry import default_registry
+
+    return default_registry().days(years)
+
+
+def solve_day(year: int, day: int, use_cache: bool = True) -> DayResult:
+    from src.aoc import solve_cached
+
+    result = DayResult(year=year, day=day)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        (result.part_a, result.part_b), hits = solve_cached(year, day, use_cache=use_cache)
+        result.cached = hits > 0
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.wall_s = time.perf_counter() - wall
+    result.cpu_s = time.process_time() - cpu
+    return result
+
+
+def _load_timings() -> Dict[str, float]:
+    try:
+        return json.loads(TIMINGS_PATH.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_timings(timings: Dict[str, float]) -> None:
+    TIMINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    TIMINGS_PATH.write_text(json.dumps(timings, indent=2, sort_keys=True))
+
+
+def run_days(days: List[Tuple[int, int]], jobs: Optional[int] = None, use_cache: bool = True) -> Iterator[DayResult]:
+    # Longest-first scheduling from the previous sweep, so slow numba days start
+    # straight away instead of being the tail that every other worker waits on
+    timings = _load_timings()
+    ordered = sorted(days, key=lambda d: timings.get(f"{d[0]}/{d[1]:02d}", float("inf")), reverse=True)
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = [pool.submit(solve_day, year, day, use_cache) for year, day in ordered]
+        for future in as_completed(futures):
+            result = future.result()
+            # Cache hits say nothing about how long the day takes to solve
+            if result.error is None and not result.cached:
+                timings[f"{result.year}/{result.day:02d}"] = result.wall_s
+            yield result
+
+    _save_timings(timings)
+
+
+def run(years: Optional[Iterable[int]] = None, jobs: Optional[int] = None, as_json: bool = False,
+        use_cache: bool = True) -> int:
+    from rich.console import Console
+
+    console = Console()
+    days = discover(years)
+    jobs = jobs or os.cpu_count()
+    if not as_json:
+        console.rule(f"[bold blue]Solving {len(days)} days on {jobs} workers")
+
+    start = time.perf_counter()
+    failed = 0
+    for result in run_days(days, jobs, use_cache):
+        if as_json:
+            print(json.dumps(asdict(result)), flush=True)
+        elif result.error:
+            console.print(f"[red]✗ {result.year} day {result.day:02d}: {result.error}")
+        else:
+            console.print(
+                f"[green]✓ {result.year} day {result.day:02d}[/green]  "
+                f"a={result.part_a}  b={result.part_b}  "
+                f"[dim]wall {result.wall_s:.3f}s  cpu {result.cpu_s:.3f}s{'  cached' if result.cached else ''}[/dim]"
+            )
+        failed += result.error is not None
+
+    if not as_json:
+        console.print(f"\n[cyan]{len(days) - failed}/{len(days)} days solved in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
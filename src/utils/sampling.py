@@ -0,0 +1,110 @@
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from timeit import default_timer as timer
+from typing import Any, Callable, List, Optional
+
+Z_95 = NormalDist().inv_cdf(0.975)
+
+
+@dataclass
+class SampleResult:
+    times_us: List[float]
+    warmup: int
+    iterations: int
+    elapsed_s: float
+    converged: bool
+    result: Any = None
+    warmup_times_us: List[float] = field(default_factory=list)
+
+    @property
+    def mean_us(self) -> float:
+        return math.fsum(self.times_us) / len(self.times_us) if self.times_us else 0.0
+
+    @property
+    def std_us(self) -> float:
+        n = len(self.times_us)
+        if n < 2:
+            return 0.0
+        mean = self.mean_us
+        return math.sqrt(math.fsum((t - mean) ** 2 for t in self.times_us) / (n - 1))
+
+    @property
+    def ci_us(self) -> float:
+        n = len(self.times_us)
+        return Z_95 * self.std_us / math.sqrt(n) if n > 1 else float("inf")
+
+    @property
+    def relative_ci(self) -> float:
+        return self.ci_us / self.mean_us if self.mean_us else float("inf")
+
+
+def warmup_cutoff(times: List[float]) -> int:
+    # MSER: drop the prefix d that minimises the squared standard error of what
+    # remains. Only the first half is considered so a slow tail can't eat the run
+    n = len(times)
+    if n < 10:
+        return 0
+    suffix_sum = [0.0] * (n + 1)
+    suffix_sq = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_sum[i] = suffix_sum[i + 1] + times[i]
+        suffix_sq[i] = suffix_sq[i + 1] + times[i] * times[i]
+
+    best_d, best_score = 0, float("inf")
+    for d in range(n // 2 + 1):
+        m = n - d
+        variance_sum = suffix_sq[d] - suffix_sum[d] ** 2 / m
+        score = variance_sum / (m * m)
+        if score < best_score:
+            best_d, best_score = d, score
+    return best_d
+
+
+def sample(func: Callable[[], Any], target_ci: float = 0.02, time_budget: float = 5.0, min_samples: int = 10,
+           max_samples: int = 10_000, setup: Optional[Callable[[], None]] = None,
+           teardown: Optional[Callable[[], None]] = None, disable_gc: bool = False) -> SampleResult:
+    if disable_gc:
+        from src.utils.environment import gc_paused
+
+        with gc_paused():
+            return sample(func, target_ci, time_budget, min_samples, max_samples, setup, teardown)
+
+    times: List[float] = []
+    result = None
+    cutoff = 0
+    converged = False
+    next_check = min_samples
+    start = timer()
+
+    while len(times) < max_samples:
+        if setup is not None:
+            setup()
+        t0 = timer()
+        result = func()
+        t1 = timer()
+        if teardown is not None:
+            teardown()
+        times.append((t1 - t0) * 1e6)
+
+        if t1 - start >= time_budget:
+            break
+        # Re-estimating the warm-up prefix is O(n), so only do it as n grows geometrically
+        if len(times) >= next_check:
+            cutoff = warmup_cutoff(times)
+            kept = SampleResult(times[cutoff:], cutoff, len(times), 0.0, False)
+            if len(kept.times_us) >= min_samples and kept.relative_ci <= target_ci:
+                converged = True
+                break
+            next_check = max(next_check + 1, int(len(times) * 1.1))
+
+    cutoff = warmup_cutoff(times)
+    return SampleResult(
+        times_us=times[cutoff:],
+        warmup=cutoff,
+        iterations=len(times),
+        elapsed_s=timer() - start,
+        converged=converged,
+        result=result,
+        warmup_times_us=times[:cutoff],
+    )
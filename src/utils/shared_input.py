@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar, Union
+
+# Day modules and solve() only need takes_bytes/accepts_bytes, so multiprocessing
+# is imported when a block is actually created or attached
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+F = TypeVar("F", bound=Callable)
+
+Input = Union[str, memoryview]
+
+
+def takes_bytes(func: F) -> F:
+    """Mark a part (or parse hook) as accepting a read-only bytes-like input as well as str.
+
+    Harness code then hands it a view of shared or mapped memory instead of a
+    decoded copy of the input.
+    """
+    setattr(func, "takes_bytes", True)
+    return func
+
+
+def accepts_bytes(func: Callable) -> bool:
+    return getattr(func, "takes_bytes", False)
+
+
+def input_for(func: Callable, view: memoryview, length: Optional[int] = None) -> Input:
+    # A prefix of the view, decoded only for parts that need str
+    view = view[:length] if length is not None else view
+    return view.toreadonly() if accepts_bytes(func) else str(view, "utf-8")
+
+
+def solver_input(func: Callable, year: int, day: int) -> Input:
+    """The stored input as `func` takes it: the store's read-only mmap view, or decoded text."""
+    from src.utils.input_store import default_store, get_input
+
+    text = get_input(year, day)
+    return (default_store().view(year, day) or text) if accepts_bytes(func) else text
+
+
+@dataclass(frozen=True)
+class InputHandle:
+    # Small enough to pickle into every task; the input itself never is
+    name: str
+    size: int
+
+
+class SharedInput:
+    """One copy of an input in POSIX shared memory, for workers to attach to by name.
+
+    The creating process owns the block and unlinks it on close.
+    """
+
+    def __init__(self, data: Union[str, bytes, memoryview]):
+        from multiprocessing import shared_memory
+
+        raw = data.encode() if isinstance(data, str) else data
+        self.size = len(raw)
+        # Zero-size blocks are not allowed
+        self.memory = shared_memory.SharedMemory(create=True, size=max(1, self.size))
+        buf = self.memory.buf
+        assert buf is not None  # only None once closed
+        buf[:self.size] = raw
+        self.handle = InputHandle(self.memory.name, self.size)
+
+    def close(self) -> None:
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self) -> "SharedInput":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# Blocks attached by this (worker) process, kept open for its lifetime
+_attached: Dict[str, "shared_memory.SharedMemory"] = {}
+
+
+def attach(handle: InputHandle) -> memoryview:
+    # Pool workers share the parent's resource tracker, so attaching here does
+    # not make anyone but the parent unlink the block
+    if handle.name not in _attached:
+        from multiprocessing import shared_memory
+
+        _attached[handle.name] = shared_memory.SharedMemory(name=handle.name)
+    buf = _attached[handle.name].buf
+    assert buf is not None
+    return buf[:handle.size]
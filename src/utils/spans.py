@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter_ns
+from timeit import default_timer as timer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass
+class PhaseTiming:
+    # Per call of the part; nested spans are keyed "outer/inner"
+    mean_us: float
+    entries: float
+    share: float  # of the part's own time
+
+
+class SpanRecorder:
+    def __init__(self):
+        self.stack: List[Tuple[str, int]] = []
+        self.totals: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+
+    def enter(self, name: str) -> None:
+        path = f"{self.stack[-1][0]}/{name}" if self.stack else name
+        if path not in self.totals:  # first entry fixes the order, outer phases before inner ones
+            self.totals[path] = self.counts[path] = 0
+        self.stack.append((path, perf_counter_ns()))
+
+    def exit(self) -> None:
+        end = perf_counter_ns()
+        path, start = self.stack.pop()
+        self.totals[path] += end - start
+        self.counts[path] += 1
+
+
+# None unless something is recording, which is all a disabled span checks
+_recorder: Optional[SpanRecorder] = None
+
+
+class span:
+    """Mark a phase of a solver, as `with span("parse"):` or `@span("parse")`.
+
+    While nothing is recording this is one global lookup per enter and exit,
+    so spans can stay in day modules; keep them out of the innermost loops.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        if _recorder is not None:
+            _recorder.enter(self.name)
+
+    def __exit__(self, *exc: object) -> None:
+        if _recorder is not None:
+            _recorder.exit()
+
+    def __call__(self, func: F) -> F:
+        name = self.name
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            recorder.enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.exit()
+
+        return cast(F, wrapper)
+
+
+@contextmanager
+def recording() -> Iterator[SpanRecorder]:
+    global _recorder
+    previous, _recorder = _recorder, SpanRecorder()
+    try:
+        yield _recorder
+    finally:
+        _recorder = previous
+
+
+def measure_phases(func: Callable[[], object], setup: Optional[Callable[[], None]] = None, max_calls: int = 50,
+                   time_budget: float = 0.5) -> Dict[str, PhaseTiming]:
+    """Run `func` under a recorder and average its spans per call; empty if it has none."""
+    calls, elapsed = 0, 0.0
+    with recording() as recorder:
+        while calls < max_calls and (calls == 0 or elapsed < time_budget):
+            if setup is not None:
+                setup()
+            start = timer()
+            func()
+            elapsed += timer() - start
+            calls += 1
+
+    per_call_ns = elapsed * 1e9 / calls
+    return {
+        path: PhaseTiming(
+            mean_us=total / calls / 1e3,
+            entries=recorder.counts[path] / calls,
+            share=total / calls / per_call_ns if per_call_ns else 0.0,
+        )
+        for path, total in recorder.totals.items()
+    }
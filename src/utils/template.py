@@ -10,15 +10,21 @@ year = now.year
 CORE_FILE = '''
 from src.aoc.aoc{YEAR} import YEAR, get_day
 from src.aoc.aoc_helper import Aoc
+from src.utils.parsing import parse_once
 
 
-def part_a(txt: str) -> int:
+@parse_once
+def parse(txt: str) -> list[str]:
+    return txt.splitlines()
+
 
+def part_a(txt: str) -> int:
+    lines = parse(txt)
     return 0
 
 
 def part_b(txt: str) -> int:
-
+    lines = parse(txt)
     return 0
 
 
@@ -1,6 +1,7 @@
 import pytest
 
 from src.aoc.aoc2022 import day_09 as d
+from src.utils.budget import Budget
 
 TEST_INPUT = """
 R 4
@@ -13,6 +14,11 @@ L 5
 R 2
 """.strip()
 
+BUDGETS = [
+    Budget("a", time_ms=2),
+    Budget("b", time_ms=2),
+]
+
 
 def test_a() -> None:
     assert d.part_a(TEST_INPUT) == 13
@@ -1,6 +1,7 @@
 import pytest
 
 from src.aoc.aoc2024 import day_05 as d
+from src.utils.budget import Budget
 
 TEST_INPUT = """
 47|53
@@ -33,6 +34,11 @@ TEST_INPUT = """
 97,13,75,29,47
 """.strip()
 
+BUDGETS = [
+    Budget("a", time_ms=1),
+    Budget("b", time_ms=2),
+]
+
 
 def test_a() -> None:
     assert d.part_a(TEST_INPUT) == 143
@@ -40,3 +46,10 @@ def test_a() -> None:
 
 def test_b() -> None:
     assert d.part_b(TEST_INPUT) == 123
+
+
+def test_generate() -> None:
+    txt = d.generate(20_000, seed=1)
+    assert len(txt) >= 20_000
+    assert txt == d.generate(20_000, seed=1)
+    assert d.part_a(txt) > 0 and d.part_b(txt) > 0
@@ -1,6 +1,7 @@
 import pytest
 
 from src.aoc.aoc2024 import day_06 as d
+from src.utils.budget import Budget
 
 TEST_INPUT = """
 ....#.....
@@ -15,6 +16,11 @@ TEST_INPUT = """
 ......#...
 """.strip()
 
+BUDGETS = [
+    Budget("a", time_ms=1, peak_mb=1),
+    Budget("b", time_ms=15, peak_mb=1),
+]
+
 
 def test_a() -> None:
     assert d.part_a(TEST_INPUT) == 41
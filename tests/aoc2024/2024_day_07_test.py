@@ -21,3 +21,11 @@ def test_a() -> None:
 
 def test_b() -> None:
     assert d.part_b(TEST_INPUT) == 11387
+
+
+def test_memo_backend() -> None:
+    from src.utils.backends import using_backend
+
+    with using_backend(d, "memo"):
+        assert (d.part_a(TEST_INPUT), d.part_b(TEST_INPUT)) == (3749, 11387)
+        assert d._possible_results_memo.cache.stats.entries > 0
@@ -2,11 +2,17 @@
 import pytest
 
 from src.aoc.aoc2024 import day_09 as d
+from src.utils.budget import Budget
 
 TEST_INPUT = """
 2333133121414131402
 """.strip()
 
+BUDGETS = [
+    Budget("a", time_ms=1),
+    Budget("b", time_ms=1),
+]
+
 
 def test_a() -> None:
     assert d.part_a(TEST_INPUT) == 1928
@@ -15,3 +21,13 @@ def test_a() -> None:
 def test_b() -> None:
     assert d.part_b(TEST_INPUT) == 2858
 
+
+def test_generate() -> None:
+    txt = d.generate(200, seed=1)
+    assert len(txt) == 201
+    assert d.part_a(txt) > 0 and d.part_b(txt) > 0
+
+
+def test_bytes_input() -> None:
+    view = memoryview(TEST_INPUT.encode())
+    assert (d.part_a(view), d.part_b(view)) == (1928, 2858)
@@ -0,0 +1,29 @@
+import importlib
+from typing import Callable, Optional
+
+import pytest
+
+# Performance budgets declared as BUDGETS in day test files, see src/utils/budget.py
+from src.utils.budget import pytest_addoption, pytest_pycollect_makeitem  # noqa: F401
+
+
+@pytest.fixture
+def sample_inputs(tmp_path, monkeypatch) -> Callable[..., str]:
+    """An input store and result cache in tmp_path, seeded on request with a day's sample input.
+
+    Both are set through the environment, so fresh interpreters (isolated runs)
+    read the same store.
+    """
+    from src.utils import input_store
+
+    monkeypatch.setenv(input_store.STORE_ENV, str(tmp_path / "inputs"))
+    monkeypatch.setenv("AOC_RESULT_CACHE", "0")
+    monkeypatch.setattr(input_store, "_store", None)
+
+    def seed(year: int, day: int, data: Optional[str] = None) -> str:
+        if data is None:
+            data = importlib.import_module(f"tests.aoc{year}.{year}_day_{day:02d}_test").TEST_INPUT
+        input_store.default_store().put(year, day, data)
+        return input_store.default_store().get(year, day)
+
+    return seed
@@ -0,0 +1,9 @@
+from src.utils.allocations import measure_allocations
+
+
+def test_transient_allocations_show_in_peak_not_net() -> None:
+    stats, result = measure_allocations(lambda: len(list(range(100_000))))
+    assert result == 100_000
+    assert stats.peak_bytes > 400_000
+    assert stats.net_bytes < 10_000
+    assert any(site.location.endswith("allocations_test.py:5") for site in stats.top_sites)
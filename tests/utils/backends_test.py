@@ -0,0 +1,31 @@
+import os
+import sys
+from types import ModuleType
+
+from src.utils.backends import ENV_VAR, backend, backends_of, select_backend, using_backend
+
+
+def test_backends_rebind_module_names(monkeypatch) -> None:
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    module = sys.modules["fake_backends_day"] = ModuleType("fake_backends_day")
+    try:
+        def fast(x: int) -> int:
+            return x * 2
+
+        def slow(x: int) -> int:
+            return x + x
+
+        for func in (fast, slow):
+            func.__module__ = module.__name__
+        module.double = backend("double", "fast", default=True)(fast)
+        backend("double", "slow")(slow)
+
+        assert backends_of(module) == ["fast", "slow"]
+        with using_backend(module, "slow"):
+            assert module.double is slow and os.environ[ENV_VAR] == "slow"
+        assert module.double is fast and ENV_VAR not in os.environ
+
+        select_backend(module, "missing")
+        assert module.double is fast
+    finally:
+        del sys.modules["fake_backends_day"]
@@ -0,0 +1,36 @@
+from src.aoc.aoc2024 import day_01, day_09
+from src.aoc.aoc_helper import ComplexityAnalyzer
+from src.utils.complexity import SizeTiming, fit, sweep
+
+
+def test_fit_reports_r_squared_and_confidence() -> None:
+    timings = [SizeTiming(n=n, times_s=[n * n * 1e-6 * (1 + jitter) for jitter in (0.0, 0.01, -0.01)])
+               for n in range(100, 1100, 100)]
+    fitted = fit(timings, scale=100)
+    assert fitted.time_complexity.startswith("Quadratic")
+    assert fitted.r_squared > 0.99
+    assert fitted.confidence > 0.5
+    assert fitted.runner_up is not None
+
+
+def test_sweep_times_prefixes_of_a_shared_input() -> None:
+    data = "\n".join(f"{i} {i + 1}" for i in range(100))
+    sizes = [data.index("\n10 "), len(data)]
+    timings = sweep(day_01.part_a, sizes, n_timings=2, data=data, jobs=2)
+    assert [t.n for t in timings] == sizes
+    assert all(len(t.times_s) == 2 for t in timings)
+
+
+def test_sweep_starts_no_size_past_the_budget() -> None:
+    # Every call is over a zero budget, so only the sizes already in flight run
+    timings = sweep(day_09.part_a, [10, 20, 40, 80], n_timings=3, time_budget=0.0, jobs=2)
+    assert [t.n for t in timings] == [len(day_09.generate(n, 0)) for n in (10, 20)]
+    assert all(len(t.times_s) == 1 for t in timings)
+
+
+def test_analyze_fits_no_class_to_fewer_than_three_sizes() -> None:
+    # The first prefix is over a zero budget, so no larger one starts
+    data = "\n".join(f"{i} {i + 1}" for i in range(100))
+    result = ComplexityAnalyzer.analyze(day_01.part_a, data, time_budget=0.0, jobs=1)
+    assert result.time_complexity == "Insufficient data"
+    assert not result.sizes
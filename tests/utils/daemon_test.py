@@ -0,0 +1,25 @@
+import threading
+from pathlib import Path
+
+from src.aoc.aoc2024 import day_01
+from src.utils.daemon import SolverServer, ping, request
+
+
+def test_daemon_answers_like_solve(tmp_path: Path, sample_inputs) -> None:
+    txt = sample_inputs(2024, 1)
+    path = tmp_path / "aoc.sock"
+    server = SolverServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert ping(path)["ok"]
+        response = request({"op": "solve", "year": 2024, "day": 1, "use_cache": False}, path, timeout=30)
+        assert response["ok"] and (response["part_a"], response["part_b"]) == (day_01.part_a(txt), day_01.part_b(txt))
+        assert response["solve_ms"] > 0
+
+        assert request({"op": "shutdown"}, path, timeout=5)["ok"]
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        server.server_close()
+    assert not path.exists()
@@ -0,0 +1,47 @@
+import gc
+import os
+
+import pytest
+from src.utils.environment import capture, gc_paused, parse_cpu_list, stabilised
+from src.utils.history import History
+from src.utils.sampling import sample
+
+
+def test_parse_cpu_list() -> None:
+    assert parse_cpu_list("0-2,5,7-8\n") == [0, 1, 2, 5, 7, 8]
+    assert parse_cpu_list("") == []
+
+
+def test_capture_records_versions_and_revision() -> None:
+    env = capture()
+    assert env.python and env.git_rev and env.cores >= len(env.usable_cores) >= 1
+    assert not env.stabilised
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs CPU affinity")
+def test_stabilised_pins_and_restores_affinity() -> None:
+    before = os.sched_getaffinity(0)
+    with stabilised() as env:
+        assert env.stabilised and len(os.sched_getaffinity(0)) >= 1
+        assert set(env.usable_cores) == os.sched_getaffinity(0)
+    assert os.sched_getaffinity(0) == before
+
+
+def test_gc_paused_inside_samples() -> None:
+    seen = []
+    result = sample(lambda: seen.append(gc.isenabled()), min_samples=3, max_samples=3, disable_gc=True)
+    assert result.iterations == 3 and not any(seen)
+    assert gc.isenabled()
+    with gc_paused():
+        assert not gc.isenabled()
+    assert gc.isenabled() and gc.get_freeze_count() == 0
+
+
+def test_history_notes_environment_changes(tmp_path) -> None:
+    history = History(tmp_path / "history.sqlite3")
+    for python in ("3.11.9", "3.12.1"):
+        metrics = {"execution_time_us": 10.0, "time_std_us": 1.0, "memory_peak": 0.0,
+                   "environment": {"python": python, "cpu_model": "cpu"}}
+        history.record(2024, 1, "a", metrics, "input")
+    (comparison,) = history.compare()
+    assert comparison.environment_changes == ["python 3.11.9 -> 3.12.1"]
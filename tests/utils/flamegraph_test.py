@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+from src.utils import flamegraph
+from src.utils.jit import kernel
+
+
+def test_profile_folds_kernels_into_named_frames(tmp_path: Path) -> None:
+    module = ModuleType("fake_day")
+
+    @kernel("(int64[::1],)", cache=False)
+    def total(xs):
+        s = 0
+        for x in xs:
+            s += x
+        return s
+
+    def part_a() -> int:
+        return sum(range(2_000)) + module.total(np.arange(100_000))
+
+    module.total = total
+    part_a()
+    graph = flamegraph.write(
+        flamegraph.profile(part_a, "fake_day_a", duration=0.2, module=module), tmp_path
+    )
+
+    assert module.total is total
+    assert graph.kernel_us > 0 and graph.samples > 0
+    collapsed = Path(graph.collapsed_path).read_text().splitlines()
+    assert any(line.startswith("test_profile_folds_kernels_into_named_frames.<locals>.part_a;[numba] total ")
+               for line in collapsed)
+    speedscope = json.loads(Path(graph.speedscope_path).read_text())
+    assert speedscope["profiles"][0]["unit"] == "microseconds"
@@ -0,0 +1,19 @@
+from src.aoc.aoc_helper import PerformanceMetrics
+from src.utils.history import History
+
+
+def metrics(mean_us: float, peak: float = 0.0) -> PerformanceMetrics:
+    return PerformanceMetrics(execution_time_us=mean_us, time_std_us=2.0, memory_bytes=0, memory_peak=peak,
+                              cpu_percent=0, iterations=50)
+
+
+def test_compare_flags_significant_slowdown(tmp_path) -> None:
+    history = History(tmp_path / "history.sqlite3")
+    history.record(2024, 5, "a", metrics(100.0), "hash")
+    history.record(2024, 5, "a", metrics(101.0), "hash")
+    history.record(2024, 5, "b", metrics(100.0, peak=8e6), "hash")
+    history.record(2024, 5, "b", metrics(150.0, peak=16e6), "hash")
+
+    results = {c.current.part: c for c in history.compare()}
+    assert not results["a"].regressed
+    assert results["b"].slower and results["b"].memory_growth
@@ -0,0 +1,30 @@
+from src.utils.input_store import InputStore, input_hash
+
+
+def test_ingest_fetch_layout(tmp_path) -> None:
+    fetched = tmp_path / "inputs"
+    fetched.mkdir()
+    (fetched / "01.in").write_text("1000\n2000\n")
+    (fetched / "notes.txt").write_text("ignored")
+
+    store = InputStore(tmp_path / "store")
+    assert store.ingest(fetched, 2022) == {1: input_hash("1000\n2000")}
+    assert InputStore(tmp_path / "store").get(2022, 1) == "1000\n2000"
+    assert store.get(2022, 2) is None
+
+
+def test_put_is_content_addressed(tmp_path) -> None:
+    store = InputStore(tmp_path)
+    first = store.put(2024, 5, "a")
+    second = store.put(2024, 5, "b")
+    assert first != second
+    assert store.path(2024, 5, first).exists()
+    assert store.get(2024, 5) == "b"
+
+
+def test_solve_with_data_does_not_store_it(sample_inputs) -> None:
+    from src.aoc import solve
+    from src.utils.input_store import default_store
+
+    assert solve(2024, 9, "2333133121414131402\n", use_cache=False) == (1928, 2858)
+    assert (2024, 9) not in default_store()
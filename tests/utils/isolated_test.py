@@ -0,0 +1,58 @@
+import os
+import sys
+
+from src.utils.isolated import cold_start, memory_ceiling, run_isolated
+
+
+def test_isolated_run_uses_a_fresh_interpreter(sample_inputs) -> None:
+    sample_inputs(2024, 1)
+    child = run_isolated(2024, 1, "a")
+    assert child["pid"] != os.getpid()
+    assert child["process_us"] > child["import_us"] + child["first_call_us"]
+
+
+def test_cold_start_summarises_runs(sample_inputs) -> None:
+    sample_inputs(2024, 1)
+    cold = cold_start(2024, 1, "b", runs=2)
+    assert cold.iterations == 2
+    assert cold.execution_time_us > cold.first_call_us > 0
+
+
+def test_memory_ceiling_is_polled_from_outside(sample_inputs) -> None:
+    sample_inputs(2024, 5)
+    ceiling = memory_ceiling(2024, 5, "b")
+    times = [elapsed_ms for elapsed_ms, _ in ceiling.samples]
+    assert len(times) > 1 and all(a < b for a, b in zip(times, times[1:]))
+
+
+def test_memory_ceiling_charges_the_part_for_what_it_allocates(sample_inputs) -> None:
+    # Parsing keeps two columns of ints, none of them cached small ints
+    rows = 200_000
+    sample_inputs(2024, 1, "\n".join(f"{10_000 + i}   {99_999 - i}" for i in range(rows)))
+    ceiling = memory_ceiling(2024, 1, "a")
+    assert ceiling.call_rss > 2 * rows * sys.getsizeof(10_000)
+    assert ceiling.peak_rss >= ceiling.call_rss
+
+
+def test_first_call_is_timed_in_process_unless_cold_start(sample_inputs, monkeypatch) -> None:
+    from src.aoc.aoc_helper import Aoc
+    from src.utils import isolated
+
+    def failing_child(*args, **kwargs):
+        spawned.append(args)
+        raise RuntimeError("isolated run failed")
+
+    spawned: list = []
+    monkeypatch.setattr(isolated, "cold_start", failing_child)
+    monkeypatch.setattr(Aoc, "run_pyperf_analysis", lambda *args, **kwargs: None)
+    sample_inputs(2024, 1)
+    aoc = Aoc(day=1, years=2024)
+    options = dict(runs=5, analyze_complexity=False, time_budget=0.05, part="a")
+
+    assert aoc.analyze_performance(aoc.test_module.d.part_a, **options).first_call_us > 0
+    assert not spawned
+    # Its next call is warm, so it is not reported as a first call
+    assert aoc.analyze_performance(aoc.test_module.d.part_a, **options).first_call_us is None
+    # A child that fails leaves the first call unavailable rather than aborting the profile
+    metrics = aoc.analyze_performance(aoc.test_module.d.part_a, cold_start=True, **options)
+    assert spawned and metrics.cold_start is None and metrics.first_call_us is None
@@ -0,0 +1,44 @@
+import numpy as np
+from src.utils.jit import is_kernel, kernel, record_compilation
+
+
+def test_kernel_compile_time_is_recorded_once() -> None:
+    @kernel("(int64[::1],)", cache=False)
+    def total(xs):
+        s = 0
+        for x in xs:
+            s += x
+        return s
+
+    assert is_kernel(total) and total.declared_signatures == ("(int64[::1],)",)
+
+    with record_compilation() as first:
+        assert total(np.arange(4)) == 6
+    with record_compilation() as second:
+        total(np.arange(4))
+
+    assert first.events == 1 and first.compile_us > 0
+    assert second.events == 0 and second.compile_us == 0
+
+
+def test_precompiled_kernels_load_without_compiling(tmp_path) -> None:
+    import os
+    import subprocess
+    import sys
+
+    from src.utils.paths import PROJECT_ROOT
+
+    env = {**os.environ, "NUMBA_CACHE_DIR": str(tmp_path)}
+    precompile = "from src.utils.jit import precompile_module; precompile_module('src.aoc.aoc2024.day_09')"
+    subprocess.run([sys.executable, "-c", precompile], cwd=PROJECT_ROOT, env=env, check=True)
+
+    solve = (
+        "from src.aoc.aoc2024 import day_09 as d\n"
+        "from src.utils.jit import record_compilation\n"
+        "with record_compilation() as compilation:\n"
+        "    assert (d.part_a('2333133121414131402'), d.part_b('2333133121414131402')) == (1928, 2858)\n"
+        "print(compilation.events)\n"
+    )
+    fresh = subprocess.run([sys.executable, "-c", solve], cwd=PROJECT_ROOT, env=env, check=True,
+                           capture_output=True, text=True)
+    assert fresh.stdout.split() == ["0"]
@@ -0,0 +1,46 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+from src.utils.lineprof import module_functions, profile_lines
+
+DAY = '''
+from src.utils.parsing import parse_once
+
+
+@parse_once
+def parse(txt):
+    return [int(x) for x in txt.split()]
+
+
+def square(x):
+    return x * x
+
+
+def part_a(txt):
+    return sum(square(x) for x in parse(txt))
+
+
+def main(txt):
+    print(part_a(txt))
+'''
+
+
+def test_profile_lines_covers_part_and_module_helpers(tmp_path: Path) -> None:
+    path = tmp_path / "fake_day.py"
+    path.write_text(DAY)
+    spec = importlib.util.spec_from_file_location("fake_day", path)
+    module = sys.modules["fake_day"] = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+        assert {f.__name__ for f in module_functions(module)} == {"parse", "square", "part_a"}
+
+        profile = profile_lines(module.part_a, "1 2 3", name="fake_day_a")
+    finally:
+        del sys.modules["fake_day"]
+
+    assert module.part_a("1 2 3") == 14
+    lines = {(line.function, line.source): line.hits for f in profile.functions for line in f.lines}
+    assert lines[("square", "return x * x")] == 3
+    assert lines[("parse", "return [int(x) for x in txt.split()]")] == 1
+    assert profile.hot_lines and profile.total_us > 0
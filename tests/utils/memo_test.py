@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from src.utils.memo import memoize
+
+
+def test_lru_eviction_and_stats() -> None:
+    calls = []
+
+    @memoize(maxsize=2)
+    def square(n: int, *, offset: int = 0) -> int:
+        calls.append(n)
+        return n * n + offset
+
+    assert [square(2), square(3), square(2), square(2, offset=1)] == [4, 9, 4, 5]
+    stats = square.cache.stats
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 3, 1, 2)
+    assert square(3) == 9 and calls == [2, 3, 2, 3]  # 3 was least recently used
+
+    square.cache.clear()
+    assert square.cache.stats.entries == 0 and not square.cache.data
+
+
+def test_size_bound() -> None:
+    @memoize(maxsize=None, max_bytes=3_000)
+    def block(n: int) -> bytes:
+        return bytes(1_000 + n)
+
+    for n in range(5):
+        block(n)
+    assert block.cache.stats.bytes <= 3_000
+    assert block.cache.stats.evictions == 3
+
+
+def test_disk_tier(tmp_path: Path) -> None:
+    calls = []
+
+    @memoize(disk=tmp_path / "memo.sqlite3")
+    def slow(n: int) -> list:
+        calls.append(n)
+        return [n] * 3
+
+    assert slow(4) == [4, 4, 4]
+    slow.cache.clear()
+    assert slow(4) == [4, 4, 4] and calls == [4]
+    assert slow.cache.stats.disk_hits == 1
+
+    slow.cache.clear(disk=True)
+    assert slow(4) == [4, 4, 4] and calls == [4, 4]
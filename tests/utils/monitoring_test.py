@@ -0,0 +1,31 @@
+import sys
+
+from src.utils.monitoring import count
+
+
+def collatz(n: int) -> int:
+    steps = 0
+    while n != 1:
+        n = n // 2 if n % 2 == 0 else 3 * n + 1
+        steps += 1
+    return steps
+
+
+def part(txt: str) -> int:
+    return sum(collatz(int(n)) for n in txt.split())
+
+
+def test_counts_calls_lines_and_branches() -> None:
+    counts = count(part, "6 7", "test", events=["calls", "lines", "branches"])
+    functions = {f.name: f for f in counts.functions}
+    assert functions["collatz"].calls == 2
+    loop_line = collatz.__code__.co_firstlineno + 2
+    assert functions["collatz"].lines[loop_line] == 8 + 16 + 2  # steps for 6 and 7, plus each exit
+    assert sum(b.count for b in functions["collatz"].branches) > 0
+    assert sys.monitoring.get_tool(sys.monitoring.PROFILER_ID) is None
+
+
+def test_calls_only_by_default() -> None:
+    counts = count(part, "6 7", "test")
+    assert {f.name: f.calls for f in counts.functions}["collatz"] == 2
+    assert not any(f.lines or f.branches for f in counts.functions)
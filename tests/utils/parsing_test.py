@@ -0,0 +1,19 @@
+from src.utils.parsing import is_parse_hook, parse_once
+
+
+def test_parse_once_shares_result_per_input() -> None:
+    calls = []
+
+    @parse_once
+    def parse(txt: str) -> list[str]:
+        calls.append(txt)
+        return txt.split()
+
+    assert parse("a b") is parse("a b")
+    assert parse("c") == ["c"]
+    assert calls == ["a b", "c"]
+    assert is_parse_hook(parse) and not is_parse_hook(parse.uncached)
+
+    parse.cache_clear()
+    parse("a b")
+    assert len(calls) == 3
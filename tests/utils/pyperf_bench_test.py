@@ -0,0 +1,31 @@
+import pyperf
+from src.aoc.aoc_helper import Aoc
+from src.utils import pyperf_bench
+from src.utils.backends import using_backend
+from src.utils.input_store import input_hash
+from src.utils.registry import default_registry
+
+
+def worker_metadata(path: str, name: str) -> set:
+    return {run.get_metadata()[name] for run in pyperf.Benchmark.load(path).get_runs()}
+
+
+def test_pyperf_workers_read_the_relocated_input_store(tmp_path, monkeypatch, sample_inputs) -> None:
+    monkeypatch.setattr(pyperf_bench, "PYPERF_DIR", tmp_path / "pyperf")
+    data = sample_inputs(2024, 1, "3   4\n4   3\n2   5\n1   3\n3   9\n3   3\n7   7")
+    aoc = Aoc(day=1, years=2024)
+    result = aoc.run_pyperf_analysis(aoc.test_module.d.part_a, warmups=0, repeats=1, part="a")
+
+    assert result.mean > 0, result.warnings
+    assert worker_metadata(result.benchmark_info["path"], "aoc_input_hash") == {input_hash(data)}
+
+
+def test_pyperf_workers_run_the_selected_backend(tmp_path, monkeypatch, sample_inputs) -> None:
+    monkeypatch.setattr(pyperf_bench, "PYPERF_DIR", tmp_path / "pyperf")
+    sample_inputs(2024, 4)
+    module = default_registry().module(2024, 4)
+    with using_backend(module, "loops"):
+        result = Aoc(day=4, years=2024).run_pyperf_analysis(module.part_a, warmups=0, repeats=1, part="a")
+
+    assert result.mean > 0, result.warnings
+    assert worker_metadata(result.benchmark_info["path"], "aoc_solver") == {"part_a_loops"}
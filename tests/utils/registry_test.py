@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from src.utils.registry import Registry
+
+
+def test_registry_indexes_day_modules_from_source(tmp_path: Path) -> None:
+    year_dir = tmp_path / "aoc2030"
+    year_dir.mkdir()
+    (year_dir / "day_03.py").write_text(
+        "from src.utils.parsing import parse_once\n\n"
+        "@parse_once\ndef parse(txt): return txt\n\n"
+        "def part_a(txt): return 1\n"
+    )
+    (year_dir / "notes.py").write_text("")
+
+    registry = Registry(aoc_dir=tmp_path, path=tmp_path / "registry.json")
+    entry = registry.get(2030, 3)
+    assert registry.days() == [(2030, 3)]
+    assert entry.module == "src.aoc.aoc2030.day_03" and entry.parts == ["a"] and entry.parse
+    assert registry.day_of(str(year_dir / "day_03.py")) == 3
+
+    (year_dir / "day_04.py").write_text("def part_b(txt): return 2\n")
+    reloaded = Registry(aoc_dir=tmp_path, path=tmp_path / "registry.json")
+    assert reloaded.days() == [(2030, 3), (2030, 4)]
+    assert reloaded.get(2030, 4).parts == ["b"]
@@ -0,0 +1,79 @@
+import functools
+from collections import Counter
+from pathlib import Path
+
+from src.utils.result_cache import ResultCache
+
+
+def test_result_cache_round_trip_and_eviction(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path / "results.sqlite3", max_entries=2)
+    cache.put(2024, 1, "a", "in", "src", 11, 0.5)
+    cache.put(2024, 1, "b", "in", "src", "abc", 0.25)
+
+    assert cache.get(2024, 1, "a", "in", "src").answer == 11
+    assert cache.get(2024, 1, "b", "in", "src").answer == "abc"
+    assert cache.get(2024, 1, "a", "in", "edited") is None
+
+    cache.get(2024, 1, "a", "in", "src")
+    cache.put(2024, 2, "a", "in", "src", None, 0.1)
+    assert cache.get(2024, 1, "b", "in", "src") is None  # least recently used
+    assert cache.get(2024, 1, "a", "in", "src") is not None
+    assert cache.stats()[0] == 2
+
+    assert cache.clear([2024]) == 2
+    assert cache.stats() == (0, 0)
+
+
+def test_source_hash_covers_imported_src_modules(tmp_path: Path, monkeypatch) -> None:
+    from src.utils import result_cache
+
+    monkeypatch.setattr(result_cache, "PROJECT_ROOT", tmp_path)
+    (tmp_path / "src" / "utils").mkdir(parents=True)
+    helper = tmp_path / "src" / "utils" / "helper.py"
+    lazy = tmp_path / "src" / "utils" / "lazy.py"
+    late = tmp_path / "src" / "utils" / "late.py"
+    day = tmp_path / "src" / "day_01.py"
+    helper.write_text("def split(txt):\n    from src.utils import late\n    return txt.split()\n")
+    lazy.write_text("X = 1\n")
+    late.write_text("Y = 1\n")
+    day.write_text("from src.utils import helper\n\n\ndef part_a(txt):\n    from src.utils.lazy import X\n    return X\n")
+
+    before = result_cache.source_hash(day)
+    helper.write_text("def split(txt):\n    from src.utils import late\n    return txt.split(',')\n")
+    after_helper = result_cache.source_hash(day)
+    lazy.write_text("X = 22\n")
+    after_lazy = result_cache.source_hash(day)
+    late.write_text("Y = 22\n")
+
+    assert len({before, after_helper, after_lazy}) == 3
+    # Only module-level imports are followed past the day file
+    assert result_cache.source_hash(day) == after_lazy
+
+
+def test_aoc_run_solves_each_part_once(tmp_path: Path, monkeypatch, sample_inputs) -> None:
+    from src.aoc.aoc2024 import day_01
+    from src.aoc.aoc_helper import Aoc, side_effects
+    from src.utils import result_cache
+
+    sample_inputs(2024, 1)
+    monkeypatch.setenv("AOC_RESULT_CACHE", "1")
+    monkeypatch.setattr(result_cache, "_cache", ResultCache(tmp_path / "results.sqlite3"))
+    calls: Counter = Counter()
+
+    def counted(func):
+        @functools.wraps(func)
+        def wrapper(txt):
+            calls[func.__name__] += 1
+            return func(txt)
+        return wrapper
+
+    for name in ("part_a", "part_b"):
+        monkeypatch.setattr(day_01, name, counted(getattr(day_01, name)))
+
+    aoc = Aoc(day=1, years=2024)
+    aoc.run(day_01.main)  # a miss solves each part once, main only prints the answers
+    assert calls == {"part_a": 1, "part_b": 1}
+    aoc.run(day_01.main)
+    assert calls == {"part_a": 1, "part_b": 1}
+    aoc.run(side_effects(lambda txt: day_01.main(txt)))  # on a hit, marked mains run for what they draw
+    assert calls == {"part_a": 2, "part_b": 2}
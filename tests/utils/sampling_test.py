@@ -0,0 +1,22 @@
+import itertools
+
+from src.utils.sampling import sample, warmup_cutoff
+
+
+def test_warmup_prefix_is_discarded() -> None:
+    assert warmup_cutoff([50.0, 40.0, 30.0] + [10.0, 11.0, 9.0] * 4) == 3
+    assert warmup_cutoff([10.0, 11.0, 9.0]) == 0
+
+
+def test_sample_stops_at_budget() -> None:
+    calls = itertools.count()
+    result = sample(lambda: next(calls), time_budget=0.0)
+    assert result.iterations == 1
+    assert not result.converged
+
+
+def test_sample_converges_on_stable_func() -> None:
+    result = sample(lambda: sum(range(100)), target_ci=0.5, time_budget=5.0)
+    assert result.converged
+    assert result.result == 4950
+    assert result.iterations == result.warmup + len(result.times_us)
@@ -0,0 +1,27 @@
+from src.utils.shared_input import SharedInput, accepts_bytes, attach, input_for, takes_bytes
+
+
+@takes_bytes
+def _bytes_part(txt):
+    return bytes(txt).count(b"\n")
+
+
+def _str_part(txt):
+    return txt.count("\n")
+
+
+def test_attach_sees_the_shared_copy() -> None:
+    with SharedInput("12\n34\n56") as shared:
+        view = attach(shared.handle)
+        assert bytes(view) == b"12\n34\n56"
+        assert shared.handle.size == 8
+
+
+def test_input_for_decodes_only_for_str_parts() -> None:
+    view = memoryview(b"12\n34\n56")
+    assert accepts_bytes(_bytes_part) and not accepts_bytes(_str_part)
+
+    as_bytes = input_for(_bytes_part, view, 5)
+    assert isinstance(as_bytes, memoryview) and as_bytes.readonly
+    assert _bytes_part(as_bytes) == 1
+    assert input_for(_str_part, view, 5) == "12\n34"
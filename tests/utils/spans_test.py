@@ -0,0 +1,25 @@
+from src.utils.spans import measure_phases, recording, span
+
+
+@span("outer")
+def solve(n: int) -> int:
+    with span("inner"):
+        total = sum(range(n))
+    with span("inner"):
+        return total + sum(range(n))
+
+
+def test_spans_are_inert_without_a_recorder() -> None:
+    assert solve(10) == 90
+    with recording() as recorder:
+        solve(10)
+    assert recorder.counts == {"outer": 1, "outer/inner": 2}
+    assert solve(10) == 90 and recorder.counts["outer"] == 1
+
+
+def test_measure_phases_averages_per_call() -> None:
+    phases = measure_phases(lambda: solve(1000), max_calls=5, time_budget=0.0)
+    assert list(phases) == ["outer", "outer/inner"]
+    assert phases["outer/inner"].entries == 2
+    assert phases["outer"].mean_us >= phases["outer/inner"].mean_us
+    assert 0 < phases["outer"].share <= 1